@@ -0,0 +1,261 @@
+"""
+=============================================================================
+NIRVANA READ - Batched AI Citizen-Impact Scoring
+Several articles per Groq prompt (the refresh pipeline runs a few at once),
+and a shared token bucket that backs off on 429 Retry-After
+=============================================================================
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+
+from metrics import AI_REQUEST_SECONDS, AI_REQUESTS
+from rss_sources import FOCUS_CATEGORIES
+from score_cache import content_key
+
+GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
+# Point at a local mock (benchmarks/mock_groq.py) for testing
+GROQ_API_URL = os.environ.get('GROQ_API_URL', 'https://api.groq.com/openai/v1/chat/completions')
+GROQ_MODEL = 'llama-3.1-8b-instant'
+# Part of every score cache key - bump when the prompt changes meaningfully
+SCORE_CACHE_NAMESPACE = f'{GROQ_MODEL}/batch-v1'
+
+AI_BATCH_SIZE = 8  # Articles per prompt
+AI_MAX_CONCURRENCY = 3  # Prompts in flight at once
+AI_RATE_PER_MINUTE = 30  # Groq free tier request limit
+AI_MAX_RETRIES = 2  # Retries per batch after a 429
+AI_REQUEST_TIMEOUT = 20
+
+
+class TokenBucket:
+    """Thread-safe token bucket; pause() empties it until a Retry-After passes"""
+
+    def __init__(self, rate_per_minute, capacity):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Nobody sends anything for `seconds`; refill starts after that"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+            self.updated = self.blocked_until
+
+
+RATE_LIMITER = TokenBucket(AI_RATE_PER_MINUTE, capacity=AI_MAX_CONCURRENCY)
+
+
+def rule_based_score(article):
+    """Score from keyword confidence when no API key is configured"""
+    return {
+        'score': min(50 + int(article.get('confidence', 1) * 10), 85),
+        'reasoning': 'Rule-based scoring (AI unavailable)',
+        'breakdown': {'impact': 65, 'urgency': 65, 'action': 65, 'relevance': 65}
+    }
+
+
+def fallback_score(article):
+    """Keyword-based score used when the AI call fails or is rate limited"""
+    confidence = article.get('confidence', 1)
+    base_score = min(45 + int(confidence * 15), 85)
+
+    return {
+        'score': base_score,
+        'reasoning': 'Keyword-based scoring (AI rate limited)',
+        'breakdown': {
+            'impact': base_score,
+            'urgency': base_score,
+            'action': base_score,
+            'relevance': base_score
+        },
+        'fallback': True  # worth retrying with AI on a later refresh
+    }
+
+
+def build_batch_prompt(articles):
+    """One prompt covering every article, numbered from 1"""
+    blocks = []
+    for i, article in enumerate(articles, 1):
+        category = article.get('matched_category')
+        category_name = FOCUS_CATEGORIES.get(category, {}).get('name_en', category)
+        blocks.append(
+            f"[{i}]\n"
+            f"**Category**: {category_name}\n"
+            f"**Title**: {article.get('title', '')}\n"
+            f"**Description**: {article.get('description', '')[:200]}"
+        )
+    items = '\n\n'.join(blocks)
+
+    return f"""Evaluate each of these {len(articles)} news items for an average Indian citizen.
+
+{items}
+
+Rate each item on 4 criteria (0-100 each):
+1. **Direct Impact**: Daily life effect?
+2. **Urgency**: How soon to know?
+3. **Actionability**: Can citizen act?
+4. **Citizen Relevance**: Relevant to majority?
+
+Respond ONLY with a JSON array, one object per item, in the same order:
+[
+    {{
+        "id": 1,
+        "direct_impact": 0-100,
+        "urgency": 0-100,
+        "actionability": 0-100,
+        "citizen_relevance": 0-100,
+        "reasoning": "brief explanation"
+    }}
+]"""
+
+
+def parse_batch_response(result_text, count):
+    """Map the model's reply to {item_number: ai_result}; tolerates partial output"""
+    parsed = {}
+    for position, raw in enumerate(re.findall(r'\{[^{}]+\}', result_text), 1):
+        try:
+            ai_result = json.loads(raw)
+        except ValueError:
+            continue
+
+        item_id = ai_result.get('id', position)
+        if not isinstance(item_id, int) or not 1 <= item_id <= count:
+            continue
+
+        avg_score = (
+            ai_result.get('direct_impact', 50) +
+            ai_result.get('urgency', 50) +
+            ai_result.get('actionability', 50) +
+            ai_result.get('citizen_relevance', 50)
+        ) / 4
+
+        parsed[item_id] = {
+            'score': int(avg_score),
+            'reasoning': ai_result.get('reasoning', ''),
+            'breakdown': {
+                'impact': ai_result.get('direct_impact', 50),
+                'urgency': ai_result.get('urgency', 50),
+                'action': ai_result.get('actionability', 50),
+                'relevance': ai_result.get('citizen_relevance', 50)
+            }
+        }
+    return parsed
+
+
+def _retry_after_seconds(response, default=2.0):
+    try:
+        return max(float(response.headers.get('Retry-After', default)), 0.0)
+    except ValueError:
+        return default
+
+
+def score_batch(articles, cache=None):
+    """Score a list of articles with one Groq call; returns results in the same order"""
+    if not GROQ_API_KEY:
+        return [rule_based_score(article) for article in articles]
+
+    prompt = build_batch_prompt(articles)
+    parsed = {}
+
+    for attempt in range(AI_MAX_RETRIES + 1):
+        RATE_LIMITER.acquire()
+        started = time.perf_counter()
+        try:
+            response = requests.post(
+                GROQ_API_URL,
+                headers={
+                    'Authorization': f'Bearer {GROQ_API_KEY}',
+                    'Content-Type': 'application/json'
+                },
+                json={
+                    'model': GROQ_MODEL,
+                    'messages': [
+                        {'role': 'system', 'content': 'Respond only with valid JSON.'},
+                        {'role': 'user', 'content': prompt}
+                    ],
+                    'temperature': 0.3,
+                    'max_tokens': 150 * len(articles) + 50
+                },
+                timeout=AI_REQUEST_TIMEOUT
+            )
+            AI_REQUEST_SECONDS.observe(time.perf_counter() - started)
+            AI_REQUESTS.inc(status=response.status_code)
+
+            if response.status_code == 200:
+                result_text = response.json()['choices'][0]['message']['content']
+                parsed = parse_batch_response(result_text, len(articles))
+                break
+            elif response.status_code == 429:
+                # Everyone waits, not just this batch
+                RATE_LIMITER.pause(_retry_after_seconds(response))
+                continue
+            else:
+                break
+
+        except requests.Timeout:
+            AI_REQUEST_SECONDS.observe(time.perf_counter() - started)
+            AI_REQUESTS.inc(status='timeout')
+            break
+        except Exception as e:
+            AI_REQUESTS.inc(status='error')
+            break
+
+    # Only real AI results are worth keeping
+    if cache is not None:
+        cache.put_many([
+            (content_key(articles[i - 1], SCORE_CACHE_NAMESPACE), result)
+            for i, result in parsed.items()
+        ])
+
+    # Anything the model skipped (or every item, on failure) gets keyword scoring
+    return [parsed.get(i, fallback_score(article)) for i, article in enumerate(articles, 1)]
+
+
+def score_cached(articles, cache=None):
+    """
+    Results for a batch, in order: hits from `cache` (a ScoreCache) skip the
+    API, the rest go out in one score_batch call. Never raises.
+    """
+    results = [None] * len(articles)
+    missing = []
+    for i, article in enumerate(articles):
+        cached_result = cache.get(content_key(article, SCORE_CACHE_NAMESPACE)) if cache is not None else None
+        if cached_result is not None:
+            results[i] = cached_result
+        else:
+            missing.append(i)
+
+    if missing:
+        batch = [articles[i] for i in missing]
+        try:
+            scores = score_batch(batch, cache)
+        except Exception as e:
+            scores = [fallback_score(article) for article in batch]
+        for i, score in zip(missing, scores):
+            results[i] = score
+    return results
@@ -6,37 +6,65 @@ WITH CONCURRENT PROCESSING FOR FASTER LOADING
 =============================================================================
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 import requests
 from datetime import datetime, timedelta, timezone
-import json
-from io import StringIO
-import csv
 import os
 import feedparser
+import html
 import re
 import hashlib
+import atexit
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from ai_scoring import GROQ_API_KEY, AI_BATCH_SIZE, AI_MAX_CONCURRENCY, score_batch, score_cached
+from refresh_pipeline import Pipeline, Stage
+from async_fetcher import iter_feeds_async
+from stream_parser import StreamingFeedParser
+from feed_cache import (
+    conditional_headers, store_validators, get_unchanged_items,
+    load_feed_cache, save_feed_cache
+)
+from score_cache import ScoreCache
+from article_store import ArticleStore
+from story_clusters import StoryClusters
+from article_archive import ArticleArchive
+from feed_scheduler import FeedScheduler
+from cache_snapshot import CacheSnapshot
+from response_cache import send_entry
+from export_stream import FORMATS as EXPORT_FORMATS, iter_export
+from news_stream import NewsStream
+from text_normalize import term_text
+from shared_cache import (
+    RefresherLock, write_snapshot_file, read_snapshot_file, file_mtime,
+    write_json_file, read_json_file
+)
+from metrics import (
+    REGISTRY, StageTimer, REFRESH_SECONDS, REFRESH_STAGE_SECONDS, REFRESH_ARTICLES,
+    FEED_FETCH_SECONDS, FEED_FETCHES, FEED_NOT_MODIFIED, FEED_BYTES,
+    AI_REQUEST_SECONDS, AI_REQUESTS
+)
 from rss_sources import (
     CURATED_SOURCES, FOCUS_CATEGORIES, get_all_feed_urls,
-    is_relevant_to_citizen
+    classify_relevance_terms
 )
 from supabase_client import (
-    init_supabase, track_interaction, update_news_feedback,
-    update_category_stats, calculate_personalized_score
+    init_supabase, track_interactions_batch, calculate_personalized_score
 )
+from interaction_queue import InteractionQueue, SQLiteInteractionSink, new_event
+from user_affinity import UserAffinityStore
 
 app = Flask(__name__)
 
 # ============== CONFIGURATION ==============
-GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
 IST = timezone(timedelta(hours=5, minutes=30))
 
 # Cache configuration
-NEWS_CACHE = []
-CACHE_TIMESTAMP = None
+# Published cache: an immutable CacheSnapshot, replaced wholesale on every
+# refresh. Readers take the reference without locking; CACHE_LOCK only
+# guards the single-refresher flag.
+NEWS_SNAPSHOT = CacheSnapshot([])
 CACHE_DURATION = timedelta(hours=12)
 CACHE_LOCK = threading.Lock()
 CACHE_REFRESHING = False
@@ -48,74 +76,165 @@ NEWS_FRESHNESS_HOURS = 72  # 3 days instead of 2
 AI_SCORE_THRESHOLD = 40  # Lowered from 55
 MAX_WORKERS = 10  # Number of concurrent feed fetchers
 
+# Refresh pipeline: bounded queues between stages and worker threads per stage
+# (triage always has one - it owns the dedup and clustering state)
+PIPELINE_QUEUE_SIZE = int(os.environ.get('PIPELINE_QUEUE_SIZE', '64'))
+PIPELINE_SCORE_WORKERS = int(os.environ.get('PIPELINE_SCORE_WORKERS', str(AI_MAX_CONCURRENCY)))
+PIPELINE_ENRICH_WORKERS = int(os.environ.get('PIPELINE_ENRICH_WORKERS', '2'))
+PIPELINE_PARSE_WORKERS = int(os.environ.get('PIPELINE_PARSE_WORKERS', '4'))
+AI_BATCH_WAIT_SECONDS = 0.1  # How long a score worker waits for its batch to fill
+
+# Fetch engine: 'async' (pooled httpx, default) or 'threads' (ThreadPoolExecutor + requests)
+FETCH_MODE = os.environ.get('FETCH_MODE', 'async')
+FETCH_DEADLINE_SECONDS = 25  # Whole refresh gives up on feeds still running after this
+FETCH_PER_HOST_LIMIT = 2  # Concurrent requests per feed host
+FETCH_MAX_CONNECTIONS = 20  # Shared connection pool size
+
+# Streaming parse: stop reading a feed after MAX_NEWS_PER_FEED entries or a run of stale ones
+STREAM_PARSE = os.environ.get('STREAM_PARSE', '1') == '1'
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_STALE_RUN = 3  # Consecutive entries past NEWS_FRESHNESS_HOURS that end the read
+
+# 'incremental' keeps scored articles between refreshes and only processes new
+# entries; 'full' rebuilds everything from scratch every time
+REFRESH_MODE = os.environ.get('REFRESH_MODE', 'incremental')
+MAX_CACHED_NEWS = 150  # Items published to the cache
+# Everything a published item has - ?fields= picks from these (in this order)
+NEWS_FIELDS = (
+    'id', 'title', 'description', 'url', 'source', 'language', 'category', 'category_hi', 'categoryKey',
+    'publishedAt', 'publishedAtIST', 'timeAgo', 'score', 'aiScore', 'reasoning', 'breakdown', 'alternates'
+)
+# The views the page asks for (PAGE_SIZE / LIST_FIELDS in index.html) are the only
+# ones worth serializing once per publish; other limits / field sets are built per request
+MEMOIZED_PAGE_SIZES = (None, 30)
+MEMOIZED_FIELD_SETS = (None, (
+    'id', 'title', 'description', 'url', 'source', 'language', 'category', 'category_hi', 'categoryKey',
+    'timeAgo', 'score', 'reasoning', 'alternates'
+))
+ARTICLE_STORE_MAX_ITEMS = 1000  # Scored items kept between incremental refreshes
+ARTICLE_STORE = ArticleStore(max_items=ARTICLE_STORE_MAX_ITEMS)
+
+# Near-duplicate stories across sources: one is scored, the rest become its alternates
+STORY_CLUSTER_THRESHOLD = 0.5  # Jaccard similarity of title+description word bigrams
+MAX_ALTERNATES = 5
+STORY_CLUSTERS = StoryClusters(threshold=STORY_CLUSTER_THRESHOLD)
+
+# Per-feed polling (incremental mode): each feed's interval adapts to how often
+# it publishes, failing feeds back off, jitter spreads requests out
+FEED_MIN_INTERVAL_MINUTES = 5
+FEED_MAX_INTERVAL_MINUTES = 360
+SCHEDULER_MIN_SLEEP = 30  # seconds between scheduler checks, at least...
+SCHEDULER_MAX_SLEEP = 300  # ...and at most
+FEED_SCHEDULER = FeedScheduler(
+    min_interval=FEED_MIN_INTERVAL_MINUTES * 60,
+    max_interval=FEED_MAX_INTERVAL_MINUTES * 60,
+    max_backoff=FEED_MAX_INTERVAL_MINUTES * 60
+)
+
+# Local state (feed validators etc.) survives restarts here
+DATA_DIR = os.environ.get('DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+FEED_CACHE_FILE = os.path.join(DATA_DIR, 'feed_cache.json')
+
+# Every publish is written to SNAPSHOT_FILE, which is loaded synchronously at
+# startup so the first request after a deploy is served from the last cache.
+# Gunicorn workers also share it: the worker holding REFRESHER_LOCK fetches and
+# writes it, the rest just load it. Set SHARED_CACHE=0 to make every process
+# refresh for itself.
+SHARED_CACHE = os.environ.get('SHARED_CACHE', '1') == '1'
+SNAPSHOT_FILE = os.path.join(DATA_DIR, 'news_snapshot.json')
+REFRESH_REQUEST_FILE = os.path.join(DATA_DIR, 'refresh.request')
+REFRESHER_LOCK = RefresherLock(os.path.join(DATA_DIR, 'refresher.lock'))
+SHARED_CACHE_POLL_SECONDS = 10
+IS_REFRESHER = False
+
+# Pipeline metrics - the refresher publishes its numbers here for the other workers
+METRICS_FILE = os.path.join(DATA_DIR, 'metrics.json')
+PIPELINE_STAGES = ('fetch', 'parse', 'filter', 'ai_score', 'personalize', 'sort')
+REFRESH_STAGES = StageTimer()  # Stage totals of the refresh in progress
+LAST_REFRESH = None
+
+# AI results are reused for unchanged articles across refreshes and restarts
+AI_SCORE_CACHE_FILE = os.path.join(DATA_DIR, 'ai_scores.sqlite3')
+AI_SCORE_CACHE_TTL_HOURS = NEWS_FRESHNESS_HOURS + 24
+AI_SCORE_CACHE_MAX_ENTRIES = 5000
+# Every published item is archived for analysts, long after it leaves the cache
+ARCHIVE_FILE = os.path.join(DATA_DIR, 'articles.sqlite3')
+ARCHIVE_RETENTION_DAYS = 90
+ARCHIVE_PAGE_SIZE = 50
+ARTICLE_ARCHIVE = ArticleArchive(ARCHIVE_FILE, retention_days=ARCHIVE_RETENTION_DAYS)
+
+# Per-user ranking: category affinity from tracked interactions, applied on /api/news?user_id=
+USER_AFFINITY_FILE = os.path.join(DATA_DIR, 'user_affinity.sqlite3')
+PERSONALIZATION_STRENGTH = 0.3  # Favourite category's scores x1.3, others less
+USER_AFFINITY = UserAffinityStore(USER_AFFINITY_FILE, max_users=2048)
+
+# Interaction tracking: queued per worker, bulk-written in the background.
+# TRACKING_DB points the writes at a local SQLite stand-in instead of Supabase
+TRACKING_DB = os.environ.get('TRACKING_DB')
+TRACKING_SPOOL_DIR = os.path.join(DATA_DIR, 'tracking-spool')
+INTERACTION_QUEUE = InteractionQueue(
+    SQLiteInteractionSink(TRACKING_DB) if TRACKING_DB else track_interactions_batch,
+    TRACKING_SPOOL_DIR,
+    max_queue=int(os.environ.get('TRACKING_QUEUE_SIZE', '10000')),
+    batch_size=200,
+    flush_interval=float(os.environ.get('TRACKING_FLUSH_SECONDS', '2')),
+    on_batch=USER_AFFINITY.record_many
+)
+
+# /api/stream: each connection holds a gthread request thread for as long as it is
+# open, so streams get at most 1/STREAM_THREAD_RATIO of a worker's WEB_THREADS
+# (gunicorn --threads, see render.yaml); everyone else polls
+WEB_THREADS = int(os.environ.get('WEB_THREADS', '32'))
+STREAM_THREAD_RATIO = int(os.environ.get('STREAM_THREAD_RATIO', '4'))
+STREAM_MAX_CLIENTS = max(1, WEB_THREADS // STREAM_THREAD_RATIO)
+NEWS_STREAM = NewsStream(max_clients=STREAM_MAX_CLIENTS, buffer_size=16, heartbeat=15)
+
+SCORE_CACHE = ScoreCache(
+    AI_SCORE_CACHE_FILE,
+    ttl_hours=AI_SCORE_CACHE_TTL_HOURS,
+    max_entries=AI_SCORE_CACHE_MAX_ENTRIES
+)
+
 # Initialize Supabase
 init_supabase()
 
 # ============== RSS PARSING ==============
 
+def fetch_feed(feed_url, source_name, language, timeout=8):
+    """Fetch + parse one feed; raises on network errors and non-200/304 responses"""
+    return handle_feed_response(feed_url, source_name, language, *download_feed(feed_url, timeout))
+
+def download_feed(feed_url, timeout=8):
+    """(status_code, headers, content) for one feed, content as handle_feed_response takes it"""
+    headers = {
+        'User-Agent': 'NirvanaRead/1.0',
+        'Accept-Encoding': 'gzip, deflate',
+        **conditional_headers(feed_url)
+    }
+    
+    # Strict timeout
+    with requests.get(feed_url, headers=headers, timeout=timeout, stream=STREAM_PARSE) as response:
+        if STREAM_PARSE and response.status_code == 200:
+            content = new_feed_parser()
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                if content.feed(chunk):
+                    break
+            else:
+                content.close()
+        else:
+            content = response.content
+    
+    return response.status_code, response.headers, content
+
+def new_feed_parser():
+    """Streaming parser that stops once it has MAX_NEWS_PER_FEED entries or the feed goes stale"""
+    stale_before = datetime.now(timezone.utc) - timedelta(hours=NEWS_FRESHNESS_HOURS)
+    return StreamingFeedParser(MAX_NEWS_PER_FEED, stale_before=stale_before, stale_run=STREAM_STALE_RUN)
+
 def parse_rss_feed_optimized(feed_url, source_name, language, timeout=8):
     """Optimized RSS parser with strict timeout"""
     try:
-        headers = {
-            'User-Agent': 'NirvanaRead/1.0',
-            'Accept-Encoding': 'gzip, deflate'
-        }
-        
-        # Strict timeout
-        response = requests.get(feed_url, headers=headers, timeout=timeout)
-        if response.status_code != 200:
-            return []
-        
-        feed = feedparser.parse(response.content)
-        items = []
-        
-        for entry in feed.entries[:MAX_NEWS_PER_FEED]:
-            try:
-                # Extract published date
-                pub_date = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    pub_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    pub_date = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
-                else:
-                    pub_date = datetime.now(timezone.utc)
-                
-                # Check freshness (72 hours)
-                hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
-                if hours_old > NEWS_FRESHNESS_HOURS:
-                    continue
-                
-                # Extract content
-                title = entry.get('title', '').strip()
-                description = entry.get('summary', entry.get('description', '')).strip()
-                description = re.sub(r'<[^>]+>', '', description)
-                description = description[:300]
-                
-                if not title or not description:
-                    continue
-                
-                # Quick relevance check
-                is_relevant, matched_category, confidence = is_relevant_to_citizen(title, description)
-                if not is_relevant:
-                    continue
-                
-                item = {
-                    'title': title,
-                    'description': description,
-                    'url': entry.get('link', ''),
-                    'publishedAt': pub_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                    'source': source_name,
-                    'language': language,
-                    'matched_category': matched_category,
-                    'confidence': confidence
-                }
-                
-                items.append(item)
-                
-            except Exception as e:
-                continue
-        
-        return items
+        return fetch_feed(feed_url, source_name, language, timeout)
         
     except requests.Timeout:
         print(f"    ⏱️ Timeout fetching {source_name}")
@@ -124,138 +243,262 @@ def parse_rss_feed_optimized(feed_url, source_name, language, timeout=8):
         print(f"    ❌ Error fetching {source_name}: {str(e)}")
         return []
 
+def handle_feed_response(feed_url, source_name, language, status_code, headers, content):
+    """
+    Turn a feed response into articles - a 304 reuses the items parsed last time.
+    `content` is the body, or a StreamingFeedParser already fed from the response.
+    """
+    if status_code == 304:
+        FEED_NOT_MODIFIED.inc(source=source_name)
+        items = [item for item in get_unchanged_items(feed_url) if is_fresh(item['publishedAt'])]
+        print(f"    ♻️ {source_name} not modified, reusing {len(items)} items")
+        return items
+    
+    if status_code != 200:
+        raise RuntimeError(f"HTTP {status_code}")
+    
+    # Parse time excludes the relevance filter, which is timed as its own stage
+    stages = StageTimer()
+    started = time.perf_counter()
+    if isinstance(content, StreamingFeedParser):
+        FEED_BYTES.inc(content.bytes_read, source=source_name)
+        items = parse_streamed_feed(content, source_name, language, stages)
+        parse_seconds = content.parse_seconds
+    else:
+        FEED_BYTES.inc(len(content), source=source_name)
+        items = parse_feed_content(content, source_name, language, stages)
+        parse_seconds = 0.0
+    filter_seconds = stages.totals().get('filter', 0.0)
+    REFRESH_STAGES.add('parse', parse_seconds + time.perf_counter() - started - filter_seconds)
+    REFRESH_STAGES.add('filter', filter_seconds)
+    
+    store_validators(feed_url, headers.get('ETag'), headers.get('Last-Modified'), items)
+    return items
+
+def parse_published_at(published_at):
+    """'publishedAt' string -> aware UTC datetime"""
+    return datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+
+def format_time_ago(pub_date):
+    """Human 'time ago' label for a UTC datetime"""
+    hours_ago = int((datetime.now(timezone.utc) - pub_date).total_seconds() / 3600)
+    if hours_ago < 1:
+        return "Just now"
+    elif hours_ago < 24:
+        return f"{hours_ago}h ago"
+    else:
+        days_ago = hours_ago // 24
+        return f"{days_ago}d ago"
+
+def is_fresh(published_at):
+    """Is a 'publishedAt' timestamp within the freshness window?"""
+    pub_date = parse_published_at(published_at)
+    hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
+    return hours_old <= NEWS_FRESHNESS_HOURS
+
+def parse_feed_content(content, source_name, language, stages=None):
+    """Parse a fetched feed body into fresh, relevant articles"""
+    feed = feedparser.parse(content)
+    candidates = []
+    
+    for entry in feed.entries[:MAX_NEWS_PER_FEED]:
+        try:
+            # Extract published date
+            pub_date = None
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                pub_date = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+                pub_date = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
+            
+            candidate = feed_candidate(
+                entry.get('title', ''),
+                entry.get('summary', entry.get('description', '')),
+                entry.get('link', ''),
+                pub_date
+            )
+            if candidate:
+                candidates.append(candidate)
+            
+        except Exception as e:
+            continue
+    
+    return classify_candidates(candidates, source_name, language, stages)
+
+def parse_streamed_feed(parser, source_name, language, stages=None):
+    """Articles from a StreamingFeedParser - feedparser takes over for feeds it couldn't read"""
+    if parser.failed:
+        print(f"    ↩️ {source_name}: streaming parse failed ({parser.error}), using feedparser")
+        return parse_feed_content(parser.body, source_name, language, stages)
+    
+    candidates = []
+    for entry in parser.entries:
+        try:
+            candidate = feed_candidate(entry['title'], entry['description'], entry['link'], entry['published'])
+            if candidate:
+                candidates.append(candidate)
+        except Exception as e:
+            continue
+    
+    return classify_candidates(candidates, source_name, language, stages)
+
+# Titles and descriptions are plain text, whichever parser read them: feedparser
+# sanitizes HTML and resolves entities, the streaming parser hands over raw text
+# (CDATA markup included), so both go through the same cleaning
+SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+def feed_text(text):
+    """Markup-free text of a feed field: no tags (or script/style bodies), entities resolved"""
+    text = TAG_RE.sub('', SCRIPT_STYLE_RE.sub('', text))
+    return SPACE_RE.sub(' ', html.unescape(text)).strip()
+
+def feed_candidate(title, description, link, pub_date):
+    """One feed entry -> cleaned article fields, or None if stale or empty"""
+    if pub_date is None:
+        pub_date = datetime.now(timezone.utc)
+    
+    # Check freshness (72 hours)
+    hours_old = (datetime.now(timezone.utc) - pub_date).total_seconds() / 3600
+    if hours_old > NEWS_FRESHNESS_HOURS:
+        return None
+    
+    # Extract content
+    title = feed_text(title)
+    description = feed_text(description)[:300]
+    
+    if not title or not description:
+        return None
+    
+    return {
+        'title': title,
+        'description': description,
+        'url': link,
+        'publishedAt': pub_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        # Normalized once here; relevance and story clustering both use it
+        'terms': term_text(f"{title} {description}")
+    }
+
+def classify_candidates(candidates, source_name, language, stages=None):
+    """Relevance check for a whole feed in one batch; keeps the relevant ones (`stages` times it)"""
+    if not candidates:
+        return []
+    
+    started = time.perf_counter()
+    categories, confidences = classify_relevance_terms([candidate['terms'] for candidate in candidates])
+    if stages is not None:
+        stages.add('filter', time.perf_counter() - started)
+    
+    return [
+        dict(candidate, source=source_name, language=language,
+             matched_category=category, confidence=confidence)
+        for candidate, category, confidence in zip(candidates, categories, confidences)
+        if category
+    ]
+
 def fetch_single_feed(feed_info):
-    """Fetch a single feed with error handling - used for concurrent processing"""
+    """Download a single feed with error handling - parse_feed_result does the rest"""
     source_name = feed_info.get('source_name', 'Unknown')
+    started = time.perf_counter()
     try:
-        articles = parse_rss_feed_optimized(
-            feed_info['url'],
-            feed_info['source_name'],
-            feed_info['language']
-        )
         return {
             'source': source_name,
-            'articles': articles,
-            'success': True
+            'articles': [],
+            'response': download_feed(feed_info['url']),
+            'success': True,
+            'elapsed': time.perf_counter() - started
         }
-    except Exception as e:
+    except requests.Timeout as e:
+        print(f"    ⏱️ Timeout fetching {source_name}")
         return {
             'source': source_name,
             'articles': [],
             'success': False,
-            'error': str(e)
+            'timeout': True,
+            'error': str(e),
+            'elapsed': time.perf_counter() - started
         }
-
-# ============== AI SCORING (SIMPLIFIED) ==============
-
-def ai_citizen_impact_score(article, category):
-    """AI citizen impact scoring with timeout protection and rate limit handling"""
-    if not GROQ_API_KEY:
-        # Fallback: Use confidence from keyword matching
+    except Exception as e:
+        print(f"    ❌ Error fetching {source_name}: {str(e)}")
         return {
-            'score': min(50 + int(article.get('confidence', 1) * 10), 85),
-            'reasoning': 'Rule-based scoring (AI unavailable)',
-            'breakdown': {'impact': 65, 'urgency': 65, 'action': 65, 'relevance': 65}
+            'source': source_name,
+            'articles': [],
+            'success': False,
+            'error': str(e),
+            'elapsed': time.perf_counter() - started
         }
-    
-    category_info = FOCUS_CATEGORIES.get(category, {})
-    category_name = category_info.get('name_en', category)
-    
-    prompt = f"""Evaluate this news for an average Indian citizen.
-
-**Category**: {category_name}
-**Title**: {article.get('title', '')}
-**Description**: {article.get('description', '')[:200]}
-
-Rate on 4 criteria (0-100 each):
-1. **Direct Impact**: Daily life effect?
-2. **Urgency**: How soon to know?
-3. **Actionability**: Can citizen act?
-4. **Citizen Relevance**: Relevant to majority?
-
-Respond ONLY with JSON:
-{{
-    "direct_impact": 0-100,
-    "urgency": 0-100,
-    "actionability": 0-100,
-    "citizen_relevance": 0-100,
-    "reasoning": "brief explanation"
-}}"""
 
+def parse_feed_result(feed_info, result):
+    """Turn a downloaded (not yet parsed) feed result into one with its relevant articles"""
+    if not result['success'] or 'response' not in result:
+        return result
+    
+    result = dict(result)
+    status_code, headers, content = result.pop('response')
     try:
-        response = requests.post(
-            'https://api.groq.com/openai/v1/chat/completions',
-            headers={
-                'Authorization': f'Bearer {GROQ_API_KEY}',
-                'Content-Type': 'application/json'
-            },
-            json={
-                'model': 'llama-3.1-8b-instant',
-                'messages': [
-                    {'role': 'system', 'content': 'Respond only with valid JSON.'},
-                    {'role': 'user', 'content': prompt}
-                ],
-                'temperature': 0.3,
-                'max_tokens': 200
-            },
-            timeout=10
+        result['articles'] = handle_feed_response(
+            feed_info['url'], feed_info['source_name'], feed_info['language'], status_code, headers, content
         )
-        
-        if response.status_code == 200:
-            result_text = response.json()['choices'][0]['message']['content']
-            json_match = re.search(r'\{[^}]+\}', result_text, re.DOTALL)
-            
-            if json_match:
-                ai_result = json.loads(json_match.group())
-                avg_score = (
-                    ai_result.get('direct_impact', 50) +
-                    ai_result.get('urgency', 50) +
-                    ai_result.get('actionability', 50) +
-                    ai_result.get('citizen_relevance', 50)
-                ) / 4
-                
-                return {
-                    'score': int(avg_score),
-                    'reasoning': ai_result.get('reasoning', ''),
-                    'breakdown': {
-                        'impact': ai_result.get('direct_impact', 50),
-                        'urgency': ai_result.get('urgency', 50),
-                        'action': ai_result.get('actionability', 50),
-                        'relevance': ai_result.get('citizen_relevance', 50)
-                    }
-                }
-        elif response.status_code == 429:
-            # Rate limit hit - use fallback with small delay
-            time.sleep(0.1)
-    
-    except requests.Timeout:
-        pass
     except Exception as e:
-        pass
+        print(f"    ❌ Error parsing {result['source']}: {str(e)}")
+        result.update(success=False, error=str(e))
+    return result
+
+def iter_feed_results(all_feeds):
+    """
+    Yield (feed_info, result) for each feed as soon as it is downloaded, using
+    FETCH_MODE. Results still carry the raw response - see parse_feed_result.
+    """
+    if FETCH_MODE == 'async':
+        print(f"🚀 Starting async fetch ({FETCH_PER_HOST_LIMIT}/host, {FETCH_DEADLINE_SECONDS}s deadline)...")
+        yield from iter_feeds_async(
+            all_feeds,
+            request_headers=conditional_headers,
+            new_body_parser=new_feed_parser if STREAM_PARSE else None,
+            timeout=8,
+            deadline=FETCH_DEADLINE_SECONDS,
+            per_host_limit=FETCH_PER_HOST_LIMIT,
+            max_connections=FETCH_MAX_CONNECTIONS
+        )
+        return
     
-    # Fallback - use keyword-based scoring
-    confidence = article.get('confidence', 1)
-    base_score = min(45 + int(confidence * 15), 85)
+    # Use ThreadPoolExecutor for concurrent feed fetching
+    print(f"🚀 Starting concurrent processing with {MAX_WORKERS} workers...")
     
-    return {
-        'score': base_score,
-        'reasoning': 'Keyword-based scoring (AI rate limited)',
-        'breakdown': {
-            'impact': base_score,
-            'urgency': base_score,
-            'action': base_score,
-            'relevance': base_score
-        }
-    }
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Submit all feeds for concurrent processing
+        future_to_feed = {executor.submit(fetch_single_feed, feed): feed for feed in all_feeds}
+        
+        for future in as_completed(future_to_feed):
+            feed_info = future_to_feed[future]
+            try:
+                result = future.result(timeout=15)  # Overall timeout per feed
+            except Exception as e:
+                result = {
+                    'source': feed_info.get('source_name', 'Unknown'),
+                    'articles': [],
+                    'success': False,
+                    'timeout': True,
+                    'error': str(e)
+                }
+            yield feed_info, result
+
+# ============== AI SCORING ==============
+
+def ai_citizen_impact_score(article, category):
+    """AI citizen impact scoring for a single article (see ai_scoring for batches)"""
+    return score_batch([dict(article, matched_category=category)])[0]
 
 # ============== MAIN NEWS FETCHING ==============
 
-def fetch_and_score_news():
-    """Fetch news from RSS feeds with concurrent processing"""
+def fetch_and_score_news(feeds=None):
+    """Fetch news from RSS feeds (all of them, or just `feeds`) with concurrent processing"""
+    global REFRESH_STAGES
+    refresh_started = time.perf_counter()
     print(f"🔄 Fetching news at {datetime.now(IST).strftime('%Y-%m-%d %H:%M:%S IST')}")
     
     try:
-        all_feeds = get_all_feed_urls()
+        all_feeds = feeds if feeds is not None else get_all_feed_urls()
         print(f"📚 Total feeds to process: {len(all_feeds)}")
     except Exception as e:
         print(f"❌ CRITICAL: Failed to get feed URLs: {str(e)}")
@@ -263,121 +506,318 @@ def fetch_and_score_news():
         print(traceback.format_exc())
         return []
     
-    all_news = []
     processed_urls = set()
-    stats = {'fetched': 0, 'filtered': 0, 'ai_processed': 0, 'final': 0, 'errors': 0, 'timeouts': 0}
+    stats = {'fetched': 0, 'known': 0, 'clustered': 0, 'filtered': 0, 'ai_processed': 0, 'final': 0,
+             'expired': 0, 'errors': 0, 'timeouts': 0}
+    stats_lock = threading.Lock()
     
-    # Use ThreadPoolExecutor for concurrent feed fetching
-    print(f"🚀 Starting concurrent processing with {MAX_WORKERS} workers...")
+    # Incremental: reuse everything scored before, minus what fell out of the window
+    store = ARTICLE_STORE if REFRESH_MODE == 'incremental' else ArticleStore(max_items=ARTICLE_STORE_MAX_ITEMS)
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=NEWS_FRESHNESS_HOURS)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    stats['expired'] = store.expire(cutoff)
     
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        # Submit all feeds for concurrent processing
-        future_to_feed = {executor.submit(fetch_single_feed, feed): feed for feed in all_feeds}
+    # Stories seen on earlier refreshes still collect alternates in incremental mode
+    clusters = STORY_CLUSTERS if REFRESH_MODE == 'incremental' else StoryClusters(threshold=STORY_CLUSTER_THRESHOLD)
+    clusters.expire(cutoff)
+    alternates = {}  # representative url -> near-duplicate articles from other sources
+    
+    # Stored items keep the alternates they collected on earlier refreshes
+    stored_by_url = {item['url']: item for item in store.items}
+    
+    # Feed handlers add their parse / filter time here from the parse workers
+    REFRESH_STAGES = stages = StageTimer()
+    completed = 0
+    
+    def triage(feed_result, emit):
+        """Dedup + story clustering of one feed's articles (single worker: it owns that state)"""
+        nonlocal completed
+        feed_info, result = feed_result
+        completed += 1
+        source_name = feed_info.get('source_name', 'Unknown')
+        record_feed_metrics(source_name, result)
         
-        completed = 0
-        for future in as_completed(future_to_feed):
-            completed += 1
-            feed_info = future_to_feed[future]
-            source_name = feed_info.get('source_name', 'Unknown')
-            
-            try:
-                result = future.result(timeout=15)  # Overall timeout per feed
+        try:
+            if result['success']:
+                articles = result['articles']
+                print(f"  ✓ [{completed}/{len(all_feeds)}] {source_name}: {len(articles)} articles")
+                stats['fetched'] += len(articles)
                 
-                if result['success']:
-                    articles = result['articles']
-                    print(f"  ✓ [{completed}/{len(all_feeds)}] {source_name}: {len(articles)} articles")
-                    stats['fetched'] += len(articles)
-                    
-                    # Process articles
-                    for article in articles:
-                        try:
-                            if article['url'] in processed_urls:
-                                continue
-                            processed_urls.add(article['url'])
-                            
-                            stats['filtered'] += 1
-                            
-                            # AI scoring
-                            category = article['matched_category']
-                            ai_result = ai_citizen_impact_score(article, category)
-                            
-                            stats['ai_processed'] += 1
-                            
-                            # RELAXED: Accept score >= 40
-                            if ai_result['score'] < AI_SCORE_THRESHOLD:
-                                continue
-                            
-                            # Calculate final score
-                            final_score = calculate_personalized_score(
-                                ai_result['score'],
-                                article['url'],
-                                category
-                            )
-                            
-                            # Convert to IST
-                            pub_date = datetime.strptime(
-                                article['publishedAt'],
-                                '%Y-%m-%dT%H:%M:%SZ'
-                            ).replace(tzinfo=timezone.utc)
-                            pub_date_ist = pub_date.astimezone(IST)
-                            
-                            # Time ago
-                            hours_ago = int((datetime.now(timezone.utc) - pub_date).total_seconds() / 3600)
-                            if hours_ago < 1:
-                                time_ago = "Just now"
-                            elif hours_ago < 24:
-                                time_ago = f"{hours_ago}h ago"
-                            else:
-                                days_ago = hours_ago // 24
-                                time_ago = f"{days_ago}d ago"
-                            
-                            news_item = {
-                                'id': hashlib.md5(article['url'].encode()).hexdigest(),
-                                'title': article['title'],
-                                'description': article['description'],
-                                'url': article['url'],
-                                'source': article['source'],
-                                'language': article['language'],
-                                'category': FOCUS_CATEGORIES[category]['name_en'],
-                                'category_hi': FOCUS_CATEGORIES[category]['name_hi'],
-                                'categoryKey': category,
-                                'publishedAt': article['publishedAt'],
-                                'publishedAtIST': pub_date_ist.strftime('%d %b, %I:%M %p'),
-                                'timeAgo': time_ago,
-                                'score': int(final_score),
-                                'aiScore': ai_result['score'],
-                                'reasoning': ai_result['reasoning'],
-                                'breakdown': ai_result['breakdown']
-                            }
-                            
-                            all_news.append(news_item)
-                            stats['final'] += 1
+                # Process articles
+                new_count = 0
+                for article in articles:
+                    try:
+                        if article['url'] in processed_urls:
+                            continue
+                        processed_urls.add(article['url'])
                         
-                        except Exception as e:
-                            stats['errors'] += 1
+                        # Already scored on an earlier refresh
+                        if store.is_known(article['url']):
+                            stats['known'] += 1
                             continue
-                else:
-                    print(f"  ✗ [{completed}/{len(all_feeds)}] {source_name}: Failed")
-                    stats['errors'] += 1
+                        
+                        new_count += 1
+                        
+                        # Same story as one already taken: not scored, shown as an alternate
+                        representative = clusters.assign(article)
+                        if representative:
+                            alternates.setdefault(representative, []).append(article)
+                            stats['clustered'] += 1
+                            continue
+                        
+                        stats['filtered'] += 1
+                        emit(article)
                     
-            except Exception as e:
-                print(f"  ⏱️ [{completed}/{len(all_feeds)}] {source_name}: Timeout/Error")
+                    except Exception as e:
+                        with stats_lock:
+                            stats['errors'] += 1
+                        continue
+                
+                FEED_SCHEDULER.record_result(feed_info['url'], True, articles, new_count)
+            elif result.get('timeout'):
+                print(f"  ⏱️ [{completed}/{len(all_feeds)}] {source_name}: Timeout ({result.get('error', '')})")
                 stats['timeouts'] += 1
+                FEED_SCHEDULER.record_result(feed_info['url'], False)
+            else:
+                print(f"  ✗ [{completed}/{len(all_feeds)}] {source_name}: Failed")
+                with stats_lock:
+                    stats['errors'] += 1
+                FEED_SCHEDULER.record_result(feed_info['url'], False)
+                
+        except Exception as e:
+            print(f"  ⏱️ [{completed}/{len(all_feeds)}] {source_name}: Timeout/Error")
+            stats['timeouts'] += 1
+            FEED_SCHEDULER.record_result(feed_info['url'], False)
+    
+    def score(articles, emit):
+        """One AI prompt per batch; anything scored on an earlier refresh comes from SCORE_CACHE"""
+        for article, ai_result in zip(articles, score_cached(articles, SCORE_CACHE)):
+            emit((article, ai_result))
+    
+    def enrich(scored, emit):
+        """Threshold, personalization and display fields for one scored article"""
+        article, ai_result = scored
+        try:
+            with stats_lock:
+                stats['ai_processed'] += 1
+            if not ai_result.get('fallback'):
+                store.mark_seen(article['url'], article['publishedAt'])
+            
+            category = article['matched_category']
+            
+            # RELAXED: Accept score >= 40
+            if ai_result['score'] < AI_SCORE_THRESHOLD:
+                return
+            
+            # Calculate final score
+            with stages.time('personalize'):
+                final_score = calculate_personalized_score(
+                    ai_result['score'],
+                    article['url'],
+                    category
+                )
+            
+            # Convert to IST
+            pub_date = datetime.strptime(
+                article['publishedAt'],
+                '%Y-%m-%dT%H:%M:%SZ'
+            ).replace(tzinfo=timezone.utc)
+            pub_date_ist = pub_date.astimezone(IST)
+            
+            emit({
+                'id': hashlib.md5(article['url'].encode()).hexdigest(),
+                'title': article['title'],
+                'description': article['description'],
+                'url': article['url'],
+                'source': article['source'],
+                'language': article['language'],
+                'category': FOCUS_CATEGORIES[category]['name_en'],
+                'category_hi': FOCUS_CATEGORIES[category]['name_hi'],
+                'categoryKey': category,
+                'publishedAt': article['publishedAt'],
+                'publishedAtIST': pub_date_ist.strftime('%d %b, %I:%M %p'),
+                'timeAgo': format_time_ago(pub_date),
+                'score': int(final_score),
+                'aiScore': ai_result['score'],
+                'reasoning': ai_result['reasoning'],
+                'breakdown': ai_result['breakdown']
+            })
+            with stats_lock:
+                stats['final'] += 1
+        
+        except Exception as e:
+            with stats_lock:
+                stats['errors'] += 1
+    
+    def parse(feed_result, emit):
+        """Parse + relevance filter of one downloaded feed, off the fetch loop"""
+        feed_info, result = feed_result
+        emit((feed_info, parse_feed_result(feed_info, result)))
+    
+    # fetch -> parse -> triage -> score -> enrich, bounded queues in between: a
+    # slow AI call holds back triage and parsing (never the downloads, which
+    # land in the fetcher's own queue), a slow feed holds back nothing
+    pipeline = Pipeline([
+        Stage('parse', parse, workers=PIPELINE_PARSE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+        Stage('triage', triage, workers=1, queue_size=PIPELINE_QUEUE_SIZE),
+        Stage('score', score, workers=PIPELINE_SCORE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE,
+              batch_size=AI_BATCH_SIZE, batch_wait=AI_BATCH_WAIT_SECONDS),
+        Stage('enrich', enrich, workers=PIPELINE_ENRICH_WORKERS, queue_size=PIPELINE_QUEUE_SIZE)
+    ])
+    new_news = pipeline.run(iter_feed_results(all_feeds))
+    
+    pipeline_stats = pipeline.stats()
+    stats['errors'] += sum(stage['errors'] for stage in pipeline_stats.values())
+    stages.add('fetch', pipeline.source_seconds)
+    stages.add('ai_score', pipeline_stats['score']['busy_seconds'])
+    
+    # Alternates go on once every feed is in: a duplicate can arrive after its story was enriched
+    for item in new_news:
+        item['alternates'] = merge_alternates(
+            stored_by_url.get(item['url'], {}).get('alternates', []),
+            alternates.pop(item['url'], [])
+        )
     
-    # Sort by score
-    all_news.sort(key=lambda x: x['score'], reverse=True)
+    # Duplicates of stories published on an earlier refresh: re-merge those items with the new alternates
+    for url, duplicates in alternates.items():
+        if url in stored_by_url:
+            stored = stored_by_url[url]
+            new_news.append(dict(stored, alternates=merge_alternates(stored.get('alternates', []), duplicates)))
     
-    # Limit to top 150
-    all_news = all_news[:150]
+    # Duplicates are never scored, so they stay known whatever happened to their story
+    for duplicates in alternates.values():
+        for article in duplicates:
+            store.mark_seen(article['url'], article['publishedAt'])
     
-    print(f"✅ FINAL Stats: Fetched={stats['fetched']}, Filtered={stats['filtered']}, "
-          f"AI={stats['ai_processed']}, Final={len(all_news)}, Errors={stats['errors']}, Timeouts={stats['timeouts']}")
+    # Persist validators so the next run (even after a restart) can send conditional GETs
+    save_feed_cache(FEED_CACHE_FILE)
+    
+    # History outlives the 72h window and the top 150
+    try:
+        ARTICLE_ARCHIVE.add_many(new_news)
+    except Exception as e:
+        print(f"⚠️ Could not archive articles: {str(e)}")
+    
+    with stages.time('sort'):
+        # Merge into the score-sorted store instead of re-sorting everything
+        store.merge(new_news)
+        
+        # Limit to top 150; "time ago" labels move on even for old items
+        all_news = [
+            dict(item, timeAgo=format_time_ago(parse_published_at(item['publishedAt'])))
+            for item in store.top(MAX_CACHED_NEWS)
+        ]
+    
+    print(f"✅ FINAL Stats: Fetched={stats['fetched']}, Known={stats['known']}, Clustered={stats['clustered']}, "
+          f"Filtered={stats['filtered']}, "
+          f"AI={stats['ai_processed']}, New={stats['final']}, Expired={stats['expired']}, Stored={len(store)}, "
+          f"Final={len(all_news)}, Errors={stats['errors']}, Timeouts={stats['timeouts']}")
+    
+    record_refresh_metrics(dict(stats, stored=len(store), published=len(all_news)),
+                           stages.totals(), time.perf_counter() - refresh_started, pipeline_stats)
     
     return all_news
 
-def update_cache():
-    """Update news cache (thread-safe)"""
-    global NEWS_CACHE, CACHE_TIMESTAMP, CACHE_REFRESHING
+def merge_alternates(existing, duplicates):
+    """Alternate-source links for a story, deduplicated by url, at most MAX_ALTERNATES"""
+    merged = list(existing)
+    urls = {alternate['url'] for alternate in merged}
+    for article in duplicates:
+        if article['url'] not in urls and len(merged) < MAX_ALTERNATES:
+            urls.add(article['url'])
+            merged.append({
+                'title': article['title'],
+                'url': article['url'],
+                'source': article['source'],
+                'language': article['language'],
+                'publishedAt': article['publishedAt']
+            })
+    return merged
+
+# ============== METRICS ==============
+
+def record_feed_metrics(source_name, result):
+    """Per-feed latency + outcome counters from a fetch result"""
+    if result['success']:
+        outcome = 'ok'
+    elif result.get('timeout'):
+        outcome = 'timeout'
+    else:
+        outcome = 'error'
+    FEED_FETCHES.inc(source=source_name, outcome=outcome)
+    if 'elapsed' in result:
+        FEED_FETCH_SECONDS.observe(result['elapsed'], source=source_name)
+
+def record_refresh_metrics(stats, stage_seconds, total_seconds, pipeline_stats=None):
+    """Keep the numbers of a finished refresh instead of only printing them"""
+    global LAST_REFRESH
+    REFRESH_SECONDS.observe(total_seconds)
+    for stage in PIPELINE_STAGES:
+        REFRESH_STAGE_SECONDS.observe(stage_seconds.get(stage, 0.0), stage=stage)
+    for name, value in stats.items():
+        REFRESH_ARTICLES.set(value, stat=name)
+    
+    LAST_REFRESH = {
+        'finished_at': datetime.now(IST).isoformat(),
+        'duration_seconds': round(total_seconds, 3),
+        'stage_seconds': {stage: round(stage_seconds.get(stage, 0.0), 3) for stage in PIPELINE_STAGES},
+        'articles': stats,
+        'pipeline': pipeline_stats
+    }
+
+def metrics_summary():
+    """Short pipeline summary for /health"""
+    ai_calls = AI_REQUESTS.samples()
+    ai_total = sum(ai_calls.values())
+    rate_limited = ai_calls.get(('429',), 0)
+    ai_latency = AI_REQUEST_SECONDS.samples().get((), {'sum': 0.0, 'count': 0})
+    
+    fetches = FEED_FETCHES.samples()
+    feed_bytes = FEED_BYTES.samples()
+    feeds = []
+    for (source,), latency in FEED_FETCH_SECONDS.samples().items():
+        feeds.append({
+            'source': source,
+            'avg_ms': round(1000 * latency['sum'] / latency['count']),
+            'fetches': latency['count'],
+            'failures': fetches.get((source, 'timeout'), 0) + fetches.get((source, 'error'), 0),
+            'kb_read': round(feed_bytes.get((source,), 0) / 1024, 1)
+        })
+    feeds.sort(key=lambda feed: feed['avg_ms'], reverse=True)
+    
+    return {
+        'last_refresh': LAST_REFRESH,
+        'ai_requests': {
+            'total': ai_total,
+            'rate_limited': rate_limited,
+            'rate_limited_ratio': round(rate_limited / ai_total, 3) if ai_total else 0.0,
+            'avg_latency_ms': round(1000 * ai_latency['sum'] / ai_latency['count']) if ai_latency['count'] else None
+        },
+        'slowest_feeds': feeds[:5]
+    }
+
+def publish_metrics():
+    """Refresher: share the pipeline metrics with the workers that don't refresh"""
+    try:
+        write_json_file(METRICS_FILE, {'prometheus': REGISTRY.render(), 'summary': metrics_summary()})
+    except Exception as e:
+        print(f"⚠️ Could not persist metrics: {str(e)}")
+
+def current_metrics():
+    """(Prometheus text, summary) - live in the refresher, from its last publish elsewhere"""
+    if not IS_REFRESHER:
+        shared = read_json_file(METRICS_FILE)
+        if shared:
+            return shared['prometheus'], shared['summary']
+    return REGISTRY.render(), metrics_summary()
+
+def update_cache(feeds=None):
+    """Update news cache (thread-safe) - from all feeds, or just the due `feeds`"""
+    global NEWS_SNAPSHOT, CACHE_REFRESHING
+    
+    if not IS_REFRESHER:
+        # Another worker owns refreshing - ask it instead of fetching ourselves
+        request_refresh()
+        return
     
     with CACHE_LOCK:
         if CACHE_REFRESHING:
@@ -390,21 +830,30 @@ def update_cache():
         print("🔄 STARTING CACHE REFRESH")
         print("=" * 60)
         
-        new_cache = fetch_and_score_news()
+        new_cache = fetch_and_score_news(feeds)
+        publish_metrics()
         
         print(f"📊 Fetched {len(new_cache)} news items")
         
         if len(new_cache) == 0:
             print("⚠️ WARNING: No news items fetched! Keeping old cache if exists.")
-            if NEWS_CACHE:
-                print(f"   Current cache has {len(NEWS_CACHE)} items, keeping it.")
+            if len(NEWS_SNAPSHOT):
+                print(f"   Current cache has {len(NEWS_SNAPSHOT)} items, keeping it.")
             else:
                 print("   No old cache exists either. Cache remains empty.")
         else:
-            with CACHE_LOCK:
-                NEWS_CACHE = new_cache
-                CACHE_TIMESTAMP = datetime.now(IST)
-                print(f"✅ Cache updated successfully: {len(NEWS_CACHE)} items at {CACHE_TIMESTAMP.strftime('%H:%M:%S')}")
+            # Build the whole snapshot first, then publish it with one reference swap
+            snapshot = CacheSnapshot(new_cache, datetime.now(IST), NEWS_SNAPSHOT.version + 1, NEWS_SNAPSHOT)
+            previous, NEWS_SNAPSHOT = NEWS_SNAPSHOT, snapshot
+            NEWS_STREAM.publish(previous, snapshot)
+            print(f"✅ Cache updated successfully: {len(snapshot)} items at "
+                  f"{snapshot.timestamp.strftime('%H:%M:%S')} (v{snapshot.version})")
+            
+            # Warm start for the next process (and the snapshot other workers follow)
+            try:
+                write_snapshot_file(SNAPSHOT_FILE, snapshot.items, snapshot.timestamp, snapshot.version)
+            except Exception as e:
+                print(f"⚠️ Could not persist snapshot: {str(e)}")
     
     except Exception as e:
         print("=" * 60)
@@ -423,27 +872,109 @@ def background_cache_refresh():
     """Background thread to refresh cache periodically"""
     while True:
         try:
-            with CACHE_LOCK:
-                needs_refresh = (
-                    not CACHE_TIMESTAMP or 
-                    (datetime.now(IST) - CACHE_TIMESTAMP) > CACHE_DURATION
-                )
+            if REFRESH_MODE == 'incremental':
+                # Poll just the feeds the scheduler says are due
+                all_feeds = get_all_feed_urls()
+                due_feeds = FEED_SCHEDULER.due_feeds(all_feeds)
+                
+                if due_feeds:
+                    print(f"🔄 Background: {len(due_feeds)}/{len(all_feeds)} feeds due, refreshing...")
+                    update_cache(due_feeds)
+                
+                wait = FEED_SCHEDULER.seconds_until_next(all_feeds)
+                if wait_for_refresh_request(min(max(wait, SCHEDULER_MIN_SLEEP), SCHEDULER_MAX_SLEEP)):
+                    update_cache()
+                continue
+            
+            cached_at = NEWS_SNAPSHOT.timestamp
+            needs_refresh = (
+                not cached_at or 
+                (datetime.now(IST) - cached_at) > CACHE_DURATION
+            )
             
             if needs_refresh:
                 print("🔄 Background: Cache expired, refreshing...")
                 update_cache()
             
             # Sleep for 30 minutes before checking again
-            time.sleep(1800)
+            if wait_for_refresh_request(1800):
+                update_cache()
         
         except Exception as e:
             print(f"❌ Background refresh error: {str(e)}")
             time.sleep(300)  # Sleep 5 min on error
 
+def request_refresh():
+    """Follower worker: leave a note for the refresher to run a full refresh"""
+    try:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with open(REFRESH_REQUEST_FILE, 'w') as f:
+            f.write(str(os.getpid()))
+        print("📨 Refresh requested from the refresher worker")
+    except Exception as e:
+        print(f"❌ Could not request refresh: {str(e)}")
+
+def wait_for_refresh_request(seconds):
+    """Sleep up to `seconds`; returns True early if a follower asked for a refresh"""
+    deadline = time.time() + seconds
+    while True:
+        if SHARED_CACHE and os.path.exists(REFRESH_REQUEST_FILE):
+            try:
+                os.remove(REFRESH_REQUEST_FILE)
+            except FileNotFoundError:
+                pass
+            return True
+        
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        time.sleep(min(remaining, 5))
+
+def load_shared_snapshot():
+    """Replace our snapshot with the one the refresher last wrote"""
+    global NEWS_SNAPSHOT
+    
+    loaded = read_snapshot_file(SNAPSHOT_FILE)
+    if loaded is None:
+        return False
+    
+    items, timestamp, version = loaded
+    # The file may be hours old: drop expired items, bring "time ago" up to date
+    items = [
+        dict(item, timeAgo=format_time_ago(parse_published_at(item['publishedAt'])))
+        for item in items if is_fresh(item['publishedAt'])
+    ]
+    previous, NEWS_SNAPSHOT = NEWS_SNAPSHOT, CacheSnapshot(items, timestamp, version, NEWS_SNAPSHOT)
+    NEWS_STREAM.publish(previous, NEWS_SNAPSHOT)
+    print(f"📥 Loaded snapshot v{version}: {len(items)} items")
+    return True
+
+def follow_shared_cache(loaded_mtime=None):
+    """Follower workers: pick up new snapshots; take over if the refresher goes away"""
+    while True:
+        try:
+            if REFRESHER_LOCK.try_acquire():
+                print("👑 Refresher lock acquired, taking over refreshing")
+                start_refresher()
+                return
+            
+            mtime = file_mtime(SNAPSHOT_FILE)
+            if mtime is not None and mtime != loaded_mtime:
+                load_shared_snapshot()
+                loaded_mtime = mtime
+        
+        except Exception as e:
+            print(f"❌ Shared cache follow error: {str(e)}")
+        
+        time.sleep(SHARED_CACHE_POLL_SECONDS)
+
 def get_cached_news():
-    """Get news from cache"""
-    with CACHE_LOCK:
-        return NEWS_CACHE.copy()
+    """Get news from cache (immutable tuple - no copy needed)"""
+    return NEWS_SNAPSHOT.items
+
+def get_snapshot():
+    """Current CacheSnapshot - a plain reference read, no lock"""
+    return NEWS_SNAPSHOT
 
 # ============== FLASK ROUTES ==============
 
@@ -454,10 +985,10 @@ def index():
 @app.route('/api/news')
 def get_news():
     try:
-        news = get_cached_news()
+        snapshot = get_snapshot()
         
         # If cache is empty, trigger refresh but still respond
-        if not news:
+        if not len(snapshot):
             print("⚠️ Cache empty, triggering background refresh...")
             threading.Thread(target=update_cache, daemon=True).start()
             return jsonify({
@@ -474,31 +1005,113 @@ def get_news():
         language = request.args.get('language')
         search = request.args.get('search', '').lower()
         
-        filtered = news
-        
-        if category and category != 'all':
-            filtered = [n for n in filtered if n['categoryKey'] == category]
+        # Users with interaction history get their own order (a sort of <= 150 items)
+        user_id = request.args.get('user_id')
+        boosts = USER_AFFINITY.boosts(user_id, PERSONALIZATION_STRENGTH) if user_id else None
         
-        if language and language != 'all':
-            filtered = [n for n in filtered if n['language'] == language]
+        # Optional paging (?limit=&cursor=) and projection (?fields=title,url,...)
+        try:
+            limit = request.args.get('limit')
+            limit = max(1, min(int(limit), MAX_CACHED_NEWS)) if limit else None
+            after = parse_news_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': f'Invalid parameter: {str(e)}'}), 400
+        fields = parse_news_fields(request.args.get('fields'))
         
-        if search:
-            filtered = [n for n in filtered if 
-                       search in n['title'].lower() or 
-                       search in n['description'].lower()]
+        def build_payload():
+            if limit is None and after is None:
+                # Posting lists + pre-lowercased text: only matching items are touched
+                filtered = snapshot.index.query(category, language, search, boosts)
+                next_after, total = None, len(filtered)
+            else:
+                filtered, next_after, total = snapshot.index.page(category, language, search, boosts, limit, after)
+            
+            payload = {
+                'success': True,
+                'news': [{f: item[f] for f in fields if f in item} for item in filtered] if fields else filtered,
+                'total': total,
+                'personalized': bool(boosts),
+                'version': snapshot.version,
+                'cached_at': snapshot.timestamp.isoformat(),
+                # Pinned to the cache version so the body (and its ETag) stays stable
+                'timestamp': snapshot.timestamp.isoformat()
+            }
+            if limit is not None:
+                payload['next_cursor'] = f'{next_after[0]}|{next_after[1]}' if next_after else None
+                payload['categories'] = snapshot.index.category_counts()
+            return payload
         
-        return jsonify({
-            'success': True,
-            'news': filtered,
-            'total': len(filtered),
-            'cached_at': CACHE_TIMESTAMP.isoformat() if CACHE_TIMESTAMP else None,
-            'timestamp': datetime.now(IST).isoformat()
-        })
+        # Category/language views (and their first pages) are serialized + compressed once per
+        # publish; searches, later pages, personalized orders and other shapes are built per request
+        key = (category or 'all', language or 'all', search, user_id if boosts else None, limit, after, fields)
+        # Only categories / languages the snapshot has: ?category=<anything> must not fill the memo
+        known_view = ((category or 'all') == 'all' or category in snapshot.index.by_category) and \
+                     ((language or 'all') == 'all' or language in snapshot.index.by_language)
+        memoize = (not search and not boosts and after is None and known_view
+                   and limit in MEMOIZED_PAGE_SIZES and fields in MEMOIZED_FIELD_SETS)
+        entry = snapshot.responses.get(key, build_payload, memoize=memoize)
+        return send_entry(entry, request)
         
     except Exception as e:
         print(f"Error in /api/news: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def parse_news_fields(value):
+    """?fields=a,b -> known field names in NEWS_FIELDS order (unknown ones dropped); None for all"""
+    wanted = set((value or '').split(','))
+    return tuple(f for f in NEWS_FIELDS if f in wanted) or None
+
+def parse_news_cursor(cursor):
+    """'score|id' from an earlier page -> (score, id); None for the first page"""
+    if not cursor:
+        return None
+    score, separator, item_id = cursor.partition('|')
+    if not separator or not item_id:
+        raise ValueError(f'bad cursor {cursor!r}')
+    return float(score), item_id
+
+@app.route('/api/stream')
+def stream_news():
+    """
+    Server-Sent Events: a 'delta' (added / updated / removed) per publish, for
+    the same category/language/search/fields as /api/news. Pass the `version`
+    the page was loaded from; if a publish was missed the client gets 'reset'.
+    """
+    # Flask answers HEAD for every GET route; a stream has no headers worth
+    # probing, and a HEAD body is never iterated
+    if request.method == 'HEAD':
+        return jsonify({'success': False, 'error': 'Use GET'}), 405, {'Allow': 'GET'}
+    
+    # A sync worker would be stuck on this one client for the whole stream
+    if not request.environ.get('wsgi.multithread'):
+        return jsonify({'success': False, 'error': 'Streaming needs a threaded worker'}), 503
+    
+    last_seen = request.headers.get('Last-Event-ID') or request.args.get('version')
+    try:
+        last_seen = int(last_seen) if last_seen else None
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid version'}), 400
+    
+    subscriber = NEWS_STREAM.subscribe(
+        category=request.args.get('category'),
+        language=request.args.get('language'),
+        search=request.args.get('search', '').lower(),
+        fields=parse_news_fields(request.args.get('fields'))
+    )
+    if subscriber is None:
+        return jsonify({'success': False, 'error': 'Too many streams, poll /api/news'}), 503
+    
+    # Subscribed before reading the version, so a publish in between is not lost
+    response = Response(NEWS_STREAM.events(subscriber, get_snapshot().version, last_seen),
+                        content_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Proxies must pass events through as they come
+    })
+    # The generator's own cleanup only runs once it has started; a response that is
+    # closed before its body is read must still give the slot back
+    response.call_on_close(lambda: NEWS_STREAM.unsubscribe(subscriber))
+    return response
+
 @app.route('/api/refresh', methods=['POST'])
 def force_refresh():
     try:
@@ -508,91 +1121,164 @@ def force_refresh():
         return jsonify({
             'success': True,
             'message': 'Cache refresh started in background',
-            'total': len(NEWS_CACHE),
+            'total': len(get_snapshot()),
             'timestamp': datetime.now(IST).isoformat()
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/archive')
+def get_archive():
+    """Paged history: ?from=&to=&category=&language=&source=&search=&limit=&cursor="""
+    try:
+        start = parse_archive_bound(request.args.get('from'))
+        end = parse_archive_bound(request.args.get('to'), end_of_day=True)
+        limit = int(request.args.get('limit', ARCHIVE_PAGE_SIZE))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Invalid parameter: {str(e)}'}), 400
+    
+    try:
+        items, next_cursor = ARTICLE_ARCHIVE.query(
+            start=start,
+            end=end,
+            category=request.args.get('category'),
+            language=request.args.get('language'),
+            source=request.args.get('source'),
+            search=request.args.get('search', '').strip(),
+            limit=limit,
+            cursor=request.args.get('cursor')
+        )
+        for item in items:
+            item['timeAgo'] = format_time_ago(parse_published_at(item['publishedAt']))
+        
+        return jsonify({
+            'success': True,
+            'news': items,
+            'count': len(items),
+            'next_cursor': next_cursor,
+            'from': start,
+            'to': end
+        })
+    except Exception as e:
+        print(f"Error in /api/archive: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def parse_archive_bound(value, end_of_day=False):
+    """'2024-05-01' (IST day) or an ISO datetime -> 'publishedAt'-style UTC string; None if empty"""
+    if not value:
+        return None
+    
+    if len(value) == 10:
+        day = datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=IST)
+        bound = day + timedelta(days=1, seconds=-1) if end_of_day else day
+    else:
+        bound = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if bound.tzinfo is None:
+            bound = bound.replace(tzinfo=IST)
+    return bound.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
 @app.route('/api/track', methods=['POST'])
 def track_user_action():
     try:
         data = request.json
-        user_id = data.get('user_id', 'anonymous')
-        news_url = data.get('news_url')
-        action = data.get('action')
-        category = data.get('category')
-        reading_time = data.get('reading_time', 0)
-        
-        track_interaction(user_id, news_url, action, category, reading_time)
-        update_news_feedback(news_url, action)
-        
-        if reading_time > 0:
-            update_category_stats(category, reading_time)
+        # Only enqueued here - the flusher thread does the (bulk) remote write
+        INTERACTION_QUEUE.put(new_event(
+            data.get('user_id', 'anonymous'),
+            data.get('news_url'),
+            data.get('action'),
+            data.get('category'),
+            data.get('reading_time', 0)
+        ))
         
-        return jsonify({'success': True})
+        return jsonify({'success': True}), 202
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/export')
-def export_csv():
+def export_news():
+    """
+    Streamed export of the same filters as /api/news (?category=&language=&search=).
+    ?format=csv|jsonl, ?gzip=1 for a .gz file; ?archive=1 (or from/to/source)
+    exports the archive instead of the live cache.
+    """
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unknown format: {fmt}'}), 400
+    compress = request.args.get('gzip') == '1'
+    
+    category = request.args.get('category')
+    language = request.args.get('language')
+    search = request.args.get('search', '').strip()
+    
     try:
-        news = get_cached_news()
-        
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        writer.writerow([
-            'Title', 'Category', 'Source', 'Language', 
-            'Score', 'AI Reasoning', 'Time', 'URL'
-        ])
-        
-        for item in news:
-            writer.writerow([
-                item['title'],
-                item['category'],
-                item['source'],
-                item['language'],
-                item['score'],
-                item['reasoning'],
-                item['publishedAtIST'],
-                item['url']
-            ])
-        
-        output.seek(0)
-        return output.getvalue(), 200, {
-            'Content-Type': 'text/csv; charset=utf-8',
-            'Content-Disposition': f'attachment; filename=nirvana-read-{datetime.now(IST).strftime("%Y%m%d")}.csv'
-        }
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        if request.args.get('archive') == '1' or any(request.args.get(k) for k in ('from', 'to', 'source')):
+            items = ARTICLE_ARCHIVE.iter_query(
+                start=parse_archive_bound(request.args.get('from')),
+                end=parse_archive_bound(request.args.get('to'), end_of_day=True),
+                category=category,
+                language=language,
+                source=request.args.get('source'),
+                search=search
+            )
+        else:
+            # The snapshot is immutable, so the generator can walk it after we return
+            items = get_snapshot().index.query(category, language, search.lower())
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    filename = f'nirvana-read-{datetime.now(IST).strftime("%Y%m%d")}.{extension}'
+    if compress:
+        mimetype, filename = 'application/gzip', filename + '.gz'
+    
+    return Response(iter_export(items, fmt, compress), content_type=mimetype, headers={
+        'Content-Disposition': f'attachment; filename={filename}',
+        'Cache-Control': 'no-cache'
+    })
 
 @app.route('/health')
 def health():
-    with CACHE_LOCK:
-        cache_age = int((datetime.now(IST) - CACHE_TIMESTAMP).total_seconds() / 60) if CACHE_TIMESTAMP else None
-        is_refreshing = CACHE_REFRESHING
+    snapshot = get_snapshot()
+    cache_age = int((datetime.now(IST) - snapshot.timestamp).total_seconds() / 60) if snapshot.timestamp else None
+    _, pipeline = current_metrics()
     
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now(IST).isoformat(),
-        'cache_size': len(NEWS_CACHE),
+        'cache_size': len(snapshot),
+        'cache_version': snapshot.version,
         'cache_age_minutes': cache_age,
-        'cache_refreshing': is_refreshing,
+        'cache_refreshing': CACHE_REFRESHING,
+        'worker': {'pid': os.getpid(), 'refresher': IS_REFRESHER, 'shared_cache': SHARED_CACHE},
         'ai_enabled': bool(GROQ_API_KEY),
+        'ai_score_cache': SCORE_CACHE.stats(),
+        'archive': ARTICLE_ARCHIVE.stats(),
+        'tracking': INTERACTION_QUEUE.stats(),
+        'user_affinity': USER_AFFINITY.stats(),
+        'stream': NEWS_STREAM.stats(),
+        'feed_schedule': FEED_SCHEDULER.summary(),
+        'pipeline': pipeline,
         'settings': {
             'freshness_hours': NEWS_FRESHNESS_HOURS,
             'ai_threshold': AI_SCORE_THRESHOLD,
-            'max_news': 150
+            'max_news': MAX_CACHED_NEWS,
+            'refresh_mode': REFRESH_MODE,
+            'stored_articles': len(ARTICLE_STORE)
         }
     })
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint (text exposition format)"""
+    text, _ = current_metrics()
+    return text, 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
 # ============== STARTUP ==============
 
-def initialize_app():
-    """Initialize app - non-blocking startup"""
-    print("🚀 Starting Nirvana Read...")
-    print(f"⚙️ Settings: {NEWS_FRESHNESS_HOURS}h freshness, Score threshold {AI_SCORE_THRESHOLD}+")
+def start_refresher():
+    """This process fetches feeds: start the background refresh threads"""
+    global IS_REFRESHER
+    IS_REFRESHER = True
     
     # Start background refresh thread
     refresh_thread = threading.Thread(target=background_cache_refresh, daemon=True)
@@ -603,6 +1289,36 @@ def initialize_app():
     initial_load = threading.Thread(target=update_cache, daemon=True)
     initial_load.start()
     print("📰 Initial news load started in background")
+
+def initialize_app():
+    """Initialize app - non-blocking startup"""
+    print("🚀 Starting Nirvana Read...")
+    print(f"⚙️ Settings: {NEWS_FRESHNESS_HOURS}h freshness, Score threshold {AI_SCORE_THRESHOLD}+")
+    
+    # Feed validators from the previous run enable conditional GETs right away
+    cached_feeds = load_feed_cache(FEED_CACHE_FILE)
+    print(f"♻️ Loaded validators for {cached_feeds} feeds")
+    
+    # Warm start: serve the last published cache immediately, refresh behind it
+    snapshot_mtime = file_mtime(SNAPSHOT_FILE)
+    try:
+        if not load_shared_snapshot():
+            print("📭 No saved snapshot, first request will wait for a refresh")
+    except Exception as e:
+        print(f"⚠️ Could not load saved snapshot: {str(e)}")
+    
+    # Every worker flushes its own tracking queue (and replays leftover spools)
+    INTERACTION_QUEUE.start()
+    atexit.register(INTERACTION_QUEUE.close)
+    
+    # Only one worker process refreshes; the others follow its snapshot file
+    if not SHARED_CACHE or REFRESHER_LOCK.try_acquire():
+        print(f"👑 Worker {os.getpid()} is the refresher")
+        start_refresher()
+    else:
+        print(f"👥 Worker {os.getpid()} follows the shared snapshot")
+        threading.Thread(target=follow_shared_cache, args=(snapshot_mtime,), daemon=True).start()
+    
     print("✅ App ready to serve requests")
 
 # Initialize when module is imported
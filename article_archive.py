@@ -0,0 +1,175 @@
+"""
+=============================================================================
+NIRVANA READ - Historical Article Archive
+Every scored news item, kept in SQLite well past the 72h / top-150 window.
+Indexes lead with the filter column and end with publish time, so each
+query is a range scan; pages are fetched by keyset cursor, never by loading
+or skipping over history. Full-text search uses FTS5 when SQLite has it.
+=============================================================================
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+MAX_PAGE_SIZE = 200
+
+
+def _fts_query(search):
+    """Words -> FTS5 prefix query; quoting keeps user input from being FTS syntax"""
+    words = search.split()
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+class ArticleArchive:
+    """Thread-safe SQLite archive of published news items with paged range queries"""
+
+    def __init__(self, path, retention_days=90):
+        self.path = path
+        self.retention_days = retention_days
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Workers that only read share the file with the refresher that writes
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS articles (
+                id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                source TEXT NOT NULL,
+                language TEXT NOT NULL,
+                category_key TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                published_at TEXT NOT NULL,
+                archived_at REAL NOT NULL,
+                item TEXT NOT NULL
+            )
+        ''')
+        for column in ('category_key', 'language', 'source'):
+            self.conn.execute(
+                f'CREATE INDEX IF NOT EXISTS idx_articles_{column} ON articles({column}, published_at, id)'
+            )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at, id)')
+
+        self.fts = self._create_fts()
+        self.conn.commit()
+
+    def _create_fts(self):
+        """External-content FTS5 index kept in sync by triggers; False if SQLite lacks FTS5"""
+        try:
+            self.conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, description, content='articles', content_rowid='rowid'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
+
+        self.conn.executescript('''
+            CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts(articles_fts, rowid, title, description)
+                VALUES ('delete', old.rowid, old.title, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, description ON articles BEGIN
+                INSERT INTO articles_fts(articles_fts, rowid, title, description)
+                VALUES ('delete', old.rowid, old.title, old.description);
+                INSERT INTO articles_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+            END;
+        ''')
+        return True
+
+    def add_many(self, items):
+        """Insert or update news items (a re-scored item keeps its first archived_at); prunes old ones"""
+        if not items:
+            return
+
+        now = time.time()
+        cutoff = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now - self.retention_days * 86400))
+        with self.lock:
+            self.conn.executemany('''
+                INSERT INTO articles (id, url, title, description, source, language, category_key,
+                                      score, published_at, archived_at, item)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title, description = excluded.description,
+                    category_key = excluded.category_key, score = excluded.score, item = excluded.item
+            ''', [
+                (item['id'], item['url'], item['title'], item['description'], item['source'],
+                 item['language'], item['categoryKey'], item['score'], item['publishedAt'], now,
+                 json.dumps(item, ensure_ascii=False))
+                for item in items
+            ])
+            self.conn.execute('DELETE FROM articles WHERE published_at < ?', (cutoff,))
+            self.conn.commit()
+
+    def query(self, start=None, end=None, category=None, language=None, source=None, search='',
+              limit=50, cursor=None):
+        """
+        One page of items, newest first: (items, next_cursor).
+        `start` / `end` are inclusive '%Y-%m-%dT%H:%M:%SZ' strings; pass the
+        returned cursor back to get the following page (None = last page).
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        clauses, params = [], []
+
+        for column, value in (('category_key', category), ('language', language), ('source', source)):
+            if value and value != 'all':
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if start:
+            clauses.append('published_at >= ?')
+            params.append(start)
+        if end:
+            clauses.append('published_at <= ?')
+            params.append(end)
+        if cursor:
+            # Keyset paging: strictly after the last row of the previous page
+            published_at, _, item_id = cursor.partition('|')
+            clauses.append('(published_at < ? OR (published_at = ? AND id < ?))')
+            params.extend([published_at, published_at, item_id])
+        if search:
+            if self.fts:
+                clauses.append('rowid IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)')
+                params.append(_fts_query(search))
+            else:
+                clauses.append('(lower(title) LIKE ? OR lower(description) LIKE ?)')
+                params.extend([f'%{search.lower()}%'] * 2)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self.lock:
+            rows = self.conn.execute(
+                f'SELECT published_at, id, item FROM articles {where} '
+                f'ORDER BY published_at DESC, id DESC LIMIT ?',
+                params + [limit + 1]
+            ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f'{rows[-1][0]}|{rows[-1][1]}'
+        return [json.loads(row[2]) for row in rows], next_cursor
+
+    def iter_query(self, **filters):
+        """Every matching item, newest first, one page in memory at a time (for exports)"""
+        cursor = None
+        while True:
+            items, cursor = self.query(limit=MAX_PAGE_SIZE, cursor=cursor, **filters)
+            yield from items
+            if not cursor:
+                return
+
+    def stats(self):
+        with self.lock:
+            size, oldest, newest = self.conn.execute(
+                'SELECT COUNT(*), MIN(published_at), MAX(published_at) FROM articles'
+            ).fetchone()
+        return {'size': size, 'oldest': oldest, 'newest': newest, 'full_text': self.fts,
+                'retention_days': self.retention_days}
@@ -0,0 +1,60 @@
+"""
+=============================================================================
+NIRVANA READ - Incremental Article Store
+Scored news items kept between refreshes, sorted by score, so a refresh only
+has to score and merge the entries it has never seen before
+=============================================================================
+"""
+
+import heapq
+
+
+def rank_key(item):
+    """Score descending, ties by id - the order /api/news pages through"""
+    return -item['score'], item['id']
+
+
+class ArticleStore:
+    """
+    Score-sorted store of published news items plus the set of article URLs
+    already processed (including ones that were scored below threshold).
+    Only the refresher touches it - no locking.
+    """
+
+    def __init__(self, max_items=1000):
+        self.max_items = max_items
+        self.items = []  # news items, highest score first
+        self.seen = {}  # article url -> publishedAt
+
+    def __len__(self):
+        return len(self.items)
+
+    def is_known(self, url):
+        return url in self.seen
+
+    def mark_seen(self, url, published_at):
+        self.seen[url] = published_at
+
+    def expire(self, cutoff):
+        """Drop items and seen URLs published before `cutoff` ('%Y-%m-%dT%H:%M:%SZ' string)"""
+        before = len(self.items)
+        # ISO-8601 UTC strings compare correctly as plain strings
+        self.items = [item for item in self.items if item['publishedAt'] >= cutoff]
+        self.seen = {url: published for url, published in self.seen.items() if published >= cutoff}
+        return before - len(self.items)
+
+    def merge(self, new_items):
+        """Merge new items into the sorted list - O(n + m log m), not a full re-sort"""
+        if not new_items:
+            return
+
+        # A re-scored item replaces its old entry
+        new_ids = {item['id'] for item in new_items}
+        existing = [item for item in self.items if item['id'] not in new_ids]
+        new_sorted = sorted(new_items, key=rank_key)
+
+        merged = heapq.merge(existing, new_sorted, key=rank_key)
+        self.items = list(merged)[:self.max_items]
+
+    def top(self, k):
+        return self.items[:k]
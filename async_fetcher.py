@@ -0,0 +1,155 @@
+"""
+=============================================================================
+NIRVANA READ - Async Feed Fetcher
+One long-lived event loop + pooled httpx client, per-host concurrency limit,
+and a deadline for the whole refresh. Only I/O happens on the loop (plus the
+streaming parser's incremental read, which decides when to stop); parsing
+the result is left to the caller's threads.
+=============================================================================
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+FETCH_HEADERS = {'User-Agent': 'NirvanaRead/1.0'}
+
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+_CLIENT = None
+_HOST_SEMAPHORES = {}
+
+_DONE = object()
+
+
+def _get_loop():
+    """Start (once) the background thread that owns the fetch event loop"""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='feed-fetch-loop', daemon=True).start()
+            _LOOP = loop
+        return _LOOP
+
+
+def _get_client(max_connections):
+    """Shared AsyncClient - connections stay alive between refreshes (loop thread only)"""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            headers=FETCH_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=120
+            )
+        )
+    return _CLIENT
+
+
+def _host_semaphore(url, per_host_limit):
+    """Per-host limiter so several feeds on one domain don't hammer it (loop thread only)"""
+    host = urlsplit(url).netloc
+    if host not in _HOST_SEMAPHORES:
+        _HOST_SEMAPHORES[host] = asyncio.Semaphore(per_host_limit)
+    return _HOST_SEMAPHORES[host]
+
+
+async def _read_body(response, new_body_parser):
+    """Whole body, or a body parser fed chunk by chunk until it has seen enough"""
+    if new_body_parser is None or response.status_code != 200:
+        return await response.aread()
+
+    body = new_body_parser()
+    async for chunk in response.aiter_bytes():
+        if body.feed(chunk):
+            # Leaving the stream context drops the rest of the download
+            return body
+    body.close()
+    return body
+
+
+async def _fetch_one(client, feed_info, request_headers, new_body_parser, results, timeout, per_host_limit):
+    source_name = feed_info.get('source_name', 'Unknown')
+    result = {'source': source_name, 'articles': [], 'success': True}
+
+    async with _host_semaphore(feed_info['url'], per_host_limit):
+        # Latency of the feed itself, not the wait for a per-host slot
+        started = time.perf_counter()
+        try:
+            headers = request_headers(feed_info['url']) if request_headers else None
+            async with client.stream('GET', feed_info['url'], headers=headers, timeout=timeout) as response:
+                content = await _read_body(response, new_body_parser)
+            result['response'] = (response.status_code, response.headers, content)
+        except httpx.TimeoutException as e:
+            print(f"    ⏱️ Timeout fetching {source_name}")
+            result.update(success=False, timeout=True, error=str(e) or 'timeout')
+        except Exception as e:
+            print(f"    ❌ Error fetching {source_name}: {str(e)}")
+            result.update(success=False, error=str(e))
+        result['elapsed'] = time.perf_counter() - started
+
+    results.put((feed_info, result))
+
+
+async def _fetch_all(feeds, request_headers, new_body_parser, results, timeout, deadline,
+                     per_host_limit, max_connections):
+    client = _get_client(max_connections)
+
+    task_to_feed = {
+        asyncio.ensure_future(_fetch_one(client, feed, request_headers, new_body_parser,
+                                         results, timeout, per_host_limit)): feed
+        for feed in feeds
+    }
+    if not task_to_feed:
+        return
+
+    _, pending = await asyncio.wait(task_to_feed, timeout=deadline)
+
+    # Whatever is still running when the deadline hits is given up on
+    for task in pending:
+        task.cancel()
+        feed = task_to_feed[task]
+        results.put((feed, {
+            'source': feed.get('source_name', 'Unknown'),
+            'articles': [],
+            'success': False,
+            'timeout': True,
+            'error': f'refresh deadline of {deadline}s exceeded',
+            'elapsed': deadline
+        }))
+
+
+def iter_feeds_async(feeds, request_headers=None, new_body_parser=None, timeout=8,
+                     deadline=25, per_host_limit=2, max_connections=20):
+    """
+    Fetch all feeds concurrently and yield (feed_info, result) as each finishes.
+
+    A successful result carries 'response': (status_code, headers, content),
+    still to be parsed; `request_headers(url)` adds per-feed headers (e.g.
+    validators). With `new_body_parser`, 200 bodies are streamed into a fresh
+    parser (see stream_parser.StreamingFeedParser), which is the `content`.
+    `result` has the same shape as app.fetch_single_feed's return value.
+    """
+    results = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(
+        _fetch_all(feeds, request_headers, new_body_parser, results, timeout, deadline,
+                   per_host_limit, max_connections),
+        _get_loop()
+    )
+    future.add_done_callback(lambda _: results.put(_DONE))
+
+    while True:
+        item = results.get()
+        if item is _DONE:
+            break
+        yield item
+
+    # Surface unexpected failures of the fetch coroutine itself
+    future.result()
@@ -0,0 +1,97 @@
+"""
+=============================================================================
+NIRVANA READ - Batch Relevance Classification
+Many articles at once: one keyword scan per article's terms gives
+a sparse article x keyword hit list, which is multiplied by the keyword x
+category matrix and the category weights. Uses NumPy when installed, plain
+Python otherwise - both give exactly is_relevant_to_citizen's answers.
+=============================================================================
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many articles the array set-up costs more than the loop it replaces.
+# The app classifies one feed (<= 15 entries) at a time, so it never gets here and
+# numpy is not in requirements.txt; bulk callers (benchmarks, backfills) can install it.
+NUMPY_MIN_BATCH = 64
+
+
+class BatchRelevance:
+    """Vectorised is_relevant_to_citizen over a list of articles"""
+
+    def __init__(self, categories, matcher):
+        self.matcher = matcher
+        self.category_keys = list(categories.keys())
+        self.weights = [categories[key].get('weight', 1.0) for key in self.category_keys]
+
+        columns = {key: i for i, key in enumerate(self.category_keys)}
+        self.keyword_index = {kw: i for i, kw in enumerate(matcher.keyword_categories)}
+        # keyword -> [(category column, times listed)] for the pure-Python path
+        self.keyword_columns = {
+            kw: [(columns[key], n) for key, n in hits.items()]
+            for kw, hits in matcher.keyword_categories.items()
+        }
+
+        if np is not None:
+            self.membership = np.zeros((len(self.keyword_index), len(self.category_keys)), dtype=np.int64)
+            for kw, row in self.keyword_index.items():
+                for column, n in self.keyword_columns[kw]:
+                    self.membership[row, column] = n
+            self.weight_vector = np.array(self.weights, dtype=np.float64)
+
+    def classify(self, texts):
+        """
+        (categories, confidences) for a list of article term texts
+        (text_normalize.term_text of title + description).
+        Irrelevant articles get category None and confidence 0.
+        """
+        matched = [self.matcher.matched_keywords(text) for text in texts]
+        if np is not None and len(matched) >= NUMPY_MIN_BATCH:
+            return self._classify_numpy(matched)
+        return self._classify_python(matched)
+
+    def _classify_numpy(self, matched):
+        rows = [i for i, keywords in enumerate(matched) for _ in keywords]
+        cols = [self.keyword_index[kw] for keywords in matched for kw in keywords]
+
+        # Sparse hits x membership: add each hit's category row to its article
+        counts = np.zeros((len(matched), len(self.category_keys)), dtype=np.int64)
+        if rows:
+            np.add.at(counts, np.array(rows), self.membership[np.array(cols)])
+
+        # count * weight per category, exactly like the scalar version (no summed floats)
+        weighted = counts * self.weight_vector
+        best = weighted.argmax(axis=1)  # first maximum wins, as in the category loop
+        confidences = weighted[np.arange(len(matched)), best]
+
+        categories = [
+            self.category_keys[column] if confidence >= 1 else None
+            for column, confidence in zip(best.tolist(), confidences.tolist())
+        ]
+        return categories, [confidence if category else 0 for category, confidence in
+                            zip(categories, confidences.tolist())]
+
+    def _classify_python(self, matched):
+        categories, confidences = [], []
+        for keywords in matched:
+            counts = [0] * len(self.category_keys)
+            for kw in keywords:
+                for column, n in self.keyword_columns[kw]:
+                    counts[column] += n
+
+            best_column, best_score = None, 0
+            for column, count in enumerate(counts):
+                weighted_score = count * self.weights[column]
+                if weighted_score > best_score:
+                    best_column, best_score = column, weighted_score
+
+            if best_column is not None and best_score >= 1:
+                categories.append(self.category_keys[best_column])
+                confidences.append(best_score)
+            else:
+                categories.append(None)
+                confidences.append(0)
+        return categories, confidences
@@ -0,0 +1,382 @@
+"""
+=============================================================================
+NIRVANA READ - Offline Pipeline Benchmark
+Replays benchmarks/fixtures/ (one recorded body per CURATED_SOURCES feed)
+through a local HTTP server and scores against the mock Groq server, so the
+whole pipeline can be timed without touching live feeds or the real API.
+
+Measures:
+    relevance  is_relevant_to_citizen over every fixture entry, one by one and batched
+    parse      parse_rss_feed_optimized per feed (+ in-memory parser split)
+    pipeline   fetch_and_score_news cold (no validators / score cache) and
+               warm (incremental: 304s + known articles)
+    api        /api/news throughput via the Flask test client
+
+Also checks that feedparser and the streaming parser give the same titles /
+descriptions (markup-bearing entries included); a mismatch exits 1.
+
+Usage:
+    python benchmarks/bench_pipeline.py                       # writes benchmarks/results/<commit>.json
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/abc1234.json
+    python benchmarks/bench_pipeline.py --feed-latency 0.05 --ai-latency 0.3
+=============================================================================
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from feed_fixtures import FIXTURE_DIR, fixture_name, load_fixtures, point_sources_at, shift_dates, start_fixture_server
+from mock_groq import start_mock_groq
+from rss_sources import classify_relevance_batch, get_all_feed_urls, is_relevant_to_citizen
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# Markup the streaming parser reads raw and feedparser sanitizes: tags in CDATA
+# titles, script / style bodies, numeric and named entities
+MARKUP_FEED = b'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Markup</title><link>https://example.org/markup</link>
+<item><title><![CDATA[<img src=x onerror=alert(1)>Petrol price hike hits commuters]]></title>
+<link>https://example.org/markup/0</link>
+<description><![CDATA[<p>Fuel <b>price</b> rises again<script>alert("x")</script> across the state.</p>]]></description>
+<pubDate>Wed, 15 Jan 2025 12:00:00 +0000</pubDate></item>
+<item><title>Hospital doctors&#8217; strike &amp; patients</title>
+<link>https://example.org/markup/1</link>
+<description>&lt;p&gt;Hospital patients wait &amp;amp; doctors strike&lt;style&gt;p{color:red}&lt;/style&gt;&lt;/p&gt;</description>
+<pubDate>Wed, 15 Jan 2025 11:00:00 +0000</pubDate></item>
+<item><title><![CDATA[Court orders <i>school</i> fee refund]]></title>
+<link>https://example.org/markup/2</link>
+<description><![CDATA[School fee &amp; tuition refund ordered by the court<br/>for parents]]></description>
+<pubDate>Wed, 15 Jan 2025 10:00:00 +0000</pubDate></item>
+</channel></rss>'''
+
+API_QUERIES = {
+    'all': '',
+    'category': '?category=economic',
+    'language': '?language=hindi',
+    'category_language': '?category=health&language=english',
+    'search': '?search=price'
+}
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+def best_of(fn, repeat):
+    """Fastest of `repeat` runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def quiet(verbose):
+    """The app prints a line per feed; keep the benchmark output readable"""
+    return contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+
+def start_app(args, fixtures):
+    """Point the app at the fixture + mock Groq servers, import it and wait for its startup refresh"""
+    feed_server, _ = start_fixture_server(fixtures, latency=args.feed_latency)
+    groq_server, groq_url = start_mock_groq(latency=args.ai_latency)
+    point_sources_at(feed_server)
+
+    # Must be set before app (and ai_scoring) are imported
+    os.environ.update({
+        'DATA_DIR': tempfile.mkdtemp(prefix='nirvana-bench-'),
+        'SHARED_CACHE': '0',
+        'REFRESH_MODE': 'full',  # background thread stays idle after the startup refresh
+        'GROQ_API_KEY': 'bench',
+        'GROQ_API_URL': groq_url
+    })
+
+    with quiet(args.verbose):
+        import ai_scoring
+        import app
+
+        # The real per-minute limit would dominate every number; a ceiling still applies
+        ai_scoring.RATE_LIMITER = ai_scoring.TokenBucket(args.ai_rate, capacity=ai_scoring.AI_MAX_CONCURRENCY)
+
+        deadline = time.monotonic() + 120
+        while (app.CACHE_REFRESHING or not len(app.get_snapshot())) and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    return app, feed_server.RequestHandlerClass.stats, groq_server.RequestHandlerClass.stats
+
+
+def bench_relevance(fixtures, repeat):
+    import feedparser
+
+    corpus = []
+    for body in fixtures.values():
+        for entry in feedparser.parse(body).entries:
+            description = re.sub(r'<[^>]+>', '', entry.get('summary', '')).strip()[:300]
+            corpus.append((entry.get('title', '').strip(), description))
+
+    def run():
+        for title, description in corpus:
+            is_relevant_to_citizen(title, description)
+
+    seconds = best_of(run, repeat)
+    batch_seconds = best_of(lambda: classify_relevance_batch(corpus), repeat)
+    return {
+        'articles': len(corpus),
+        'relevant': sum(1 for title, description in corpus if is_relevant_to_citizen(title, description)[0]),
+        'total_ms': round(seconds * 1000, 3),
+        'per_article_us': round(seconds / len(corpus) * 1e6, 2),
+        'batch_total_ms': round(batch_seconds * 1000, 3),
+        'batch_per_article_us': round(batch_seconds / len(corpus) * 1e6, 2)
+    }
+
+
+def bench_parse(app, fixtures, repeat, verbose):
+    per_feed = {}
+    with quiet(verbose):
+        for feed in get_all_feed_urls():
+            # ?fresh: always a 200, never a 304 from the stored validators
+            url = f"{feed['url']}?fresh"
+            seconds = best_of(lambda: app.parse_rss_feed_optimized(url, feed['source_name'], feed['language']),
+                              repeat)
+            per_feed[feed['source_name']] = round(seconds * 1000, 3)
+
+    # Same bodies without the network: feedparser vs the streaming parser
+    bodies = [(shift_dates(body), feed) for feed in get_all_feed_urls()
+              for name, body in fixtures.items() if name == fixture_name(feed)]
+
+    def feedparser_all():
+        for body, feed in bodies:
+            app.parse_feed_content(body, feed['source_name'], feed['language'])
+
+    def streaming_all():
+        for body, feed in bodies:
+            app.parse_streamed_feed(streamed(app, body), feed['source_name'], feed['language'])
+
+    return {
+        'feeds': len(per_feed),
+        'http_total_ms': round(sum(per_feed.values()), 3),
+        'http_per_feed_ms': per_feed,
+        'in_memory_feedparser_ms': round(best_of(feedparser_all, repeat) * 1000, 3),
+        'in_memory_streaming_ms': round(best_of(streaming_all, repeat) * 1000, 3)
+    }
+
+
+def streamed(app, body):
+    parser = app.new_feed_parser()
+    for start in range(0, len(body), app.STREAM_CHUNK_SIZE):
+        if parser.feed(body[start:start + app.STREAM_CHUNK_SIZE]):
+            break
+    else:
+        parser.close()
+    return parser
+
+
+def check_parsers_agree(app, fixtures):
+    """Entries where feedparser and the streaming parser give different text, printed; returns the count"""
+    problems = []
+    with quiet(False):
+        for name, body in [('markup', MARKUP_FEED)] + sorted(fixtures.items()):
+            body = shift_dates(body)
+            expected = [(a['title'], a['description']) for a in app.parse_feed_content(body, name, 'english')]
+            got = [(a['title'], a['description']) for a in app.parse_streamed_feed(streamed(app, body), name, 'english')]
+            if name == 'markup' and len(expected) != 3:
+                problems.append(f"markup: {len(expected)} of 3 entries kept")
+            problems += [f"{name}: only one parser gave {pair}" for pair in set(expected) ^ set(got)]
+            problems += [f"{name}: markup left in {pair}" for pair in got if '<' in pair[0] + pair[1]]
+    for problem in problems:
+        print(f"  ❌ {problem}")
+    return len(problems)
+
+
+def run_refresh(app, feed_stats, groq_stats, verbose):
+    """One fetch_and_score_news call with server-side traffic deltas"""
+    feeds_before, groq_before = dict(feed_stats), dict(groq_stats)
+    with quiet(verbose):
+        start = time.perf_counter()
+        items = app.fetch_and_score_news()
+        seconds = time.perf_counter() - start
+
+    last = app.LAST_REFRESH or {}
+    return items, {
+        'seconds': round(seconds, 4),
+        'stage_seconds': last.get('stage_seconds', {}),
+        'articles': last.get('articles', {}),
+        'feed_requests': feed_stats['requests'] - feeds_before['requests'],
+        'feed_not_modified': feed_stats['not_modified'] - feeds_before['not_modified'],
+        'feed_kb_served': round((feed_stats['bytes'] - feeds_before['bytes']) / 1024, 1),
+        'ai_requests': groq_stats['requests'] - groq_before['requests']
+    }
+
+
+def bench_pipeline(app, feed_stats, groq_stats, repeat, verbose):
+    import feed_cache
+    from article_store import ArticleStore
+    from score_cache import ScoreCache
+
+    cold_runs = []
+    items = []
+    for run in range(repeat):
+        # Nothing remembered: every feed is a 200 and every article goes to the AI
+        feed_cache._FEEDS.clear()
+        app.SCORE_CACHE = ScoreCache(os.path.join(app.DATA_DIR, f'bench-scores-{run}.sqlite3'))
+        app.REFRESH_MODE = 'full'
+        items, result = run_refresh(app, feed_stats, groq_stats, verbose)
+        cold_runs.append(result)
+
+    # Warm incremental refresh: validators -> 304s, stored articles -> no AI calls
+    app.REFRESH_MODE = 'incremental'
+    app.ARTICLE_STORE = ArticleStore(max_items=app.ARTICLE_STORE_MAX_ITEMS)
+    run_refresh(app, feed_stats, groq_stats, verbose)
+    warm_runs = [run_refresh(app, feed_stats, groq_stats, verbose)[1] for _ in range(repeat)]
+    app.REFRESH_MODE = 'full'
+
+    return items, {
+        'cold': min(cold_runs, key=lambda result: result['seconds']),
+        'warm_incremental': min(warm_runs, key=lambda result: result['seconds'])
+    }
+
+
+def bench_api(app, items, requests_per_query):
+    from cache_snapshot import CacheSnapshot
+
+    app.NEWS_SNAPSHOT = CacheSnapshot(items, datetime.now(app.IST), app.NEWS_SNAPSHOT.version + 1)
+    client = app.app.test_client()
+    results = {'items': len(items)}
+
+    for name, query in API_QUERIES.items():
+        first = client.get(f'/api/news{query}', headers={'Accept-Encoding': 'gzip'})
+        etag = first.headers.get('ETag')
+
+        for variant, headers in (('', {'Accept-Encoding': 'gzip'}),
+                                 ('_revalidate', {'Accept-Encoding': 'gzip', 'If-None-Match': etag})):
+            latencies = []
+            start = time.perf_counter()
+            for _ in range(requests_per_query):
+                request_start = time.perf_counter()
+                response = client.get(f'/api/news{query}', headers=headers)
+                response.get_data()
+                latencies.append(time.perf_counter() - request_start)
+            seconds = time.perf_counter() - start
+
+            latencies.sort()
+            results[name + variant] = {
+                'status': response.status_code,
+                'bytes': len(first.get_data()) if not variant else 0,
+                'requests_per_sec': round(requests_per_query / seconds, 1),
+                'p50_ms': round(statistics.median(latencies) * 1000, 3),
+                'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3)
+            }
+    return results
+
+
+def flatten(data, prefix=''):
+    flat = {}
+    for key, value in data.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(old, new):
+    """Print timing / throughput changes between two result files"""
+    old_flat, new_flat = flatten(old['results']), flatten(new['results'])
+    print(f"\n📊 {old['meta']['commit']} -> {new['meta']['commit']}")
+    for name, value in new_flat.items():
+        before = old_flat.get(name)
+        if not before or not re.search(r'(_ms|_us|seconds|_per_sec)$|seconds\.', name):
+            continue
+        change = (value - before) / before * 100
+        better = change > 0 if name.endswith('_per_sec') else change < 0
+        marker = '✅' if better and abs(change) >= 5 else ('❌' if abs(change) >= 5 else '  ')
+        print(f"  {marker} {name:60} {before:>12} -> {value:>12}  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    parser.add_argument('--output', help='result file (default benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--requests', type=int, default=300, help='/api/news requests per query')
+    parser.add_argument('--feed-latency', type=float, default=0.0, help='seconds per feed response')
+    parser.add_argument('--ai-latency', type=float, default=0.05, help='seconds per mock Groq call')
+    parser.add_argument('--ai-rate', type=float, default=6000, help='AI requests per minute allowed')
+    parser.add_argument('--verbose', action='store_true', help='show the app\'s own logging')
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    commit, dirty = git_revision()
+    print(f"🏁 Benchmarking {commit}{' (dirty)' if dirty else ''} with {len(fixtures)} feed fixtures")
+
+    app, feed_stats, groq_stats = start_app(args, fixtures)
+
+    results = {}
+    results['relevance'] = bench_relevance(fixtures, args.repeat)
+    print(f"  relevance: {results['relevance']['per_article_us']} µs/article")
+
+    results['parse'] = bench_parse(app, fixtures, args.repeat, args.verbose)
+    print(f"  parse: {results['parse']['http_total_ms']} ms for {results['parse']['feeds']} feeds over HTTP")
+    mismatches = check_parsers_agree(app, fixtures)
+    print(f"  parsers agree: {'yes' if not mismatches else f'no, {mismatches} mismatches'}")
+
+    items, results['pipeline'] = bench_pipeline(app, feed_stats, groq_stats, args.repeat, args.verbose)
+    print(f"  pipeline: cold {results['pipeline']['cold']['seconds']}s, "
+          f"warm {results['pipeline']['warm_incremental']['seconds']}s")
+
+    results['api'] = bench_api(app, items, args.requests)
+    print(f"  api: {results['api']['all']['requests_per_sec']} req/s unfiltered, "
+          f"{results['api']['search']['requests_per_sec']} req/s search")
+
+    output = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args)
+        },
+        'results': results
+    }
+
+    path = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"💾 Results written to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), output)
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+=============================================================================
+NIRVANA READ - Relevance Matcher Benchmark
+Compares the compiled KeywordMatcher against the original per-keyword loop,
+and the one-call batch classifier (NumPy if installed) against both. The
+legacy loop matches substrings, so headlines where it differs are counted
+(those are its false positives / missed variants), not treated as errors
+
+Usage:
+    python benchmarks/bench_relevance.py                      # synthetic corpus
+    python benchmarks/bench_relevance.py --live --save h.tsv  # real headlines
+    python benchmarks/bench_relevance.py --headlines h.tsv
+=============================================================================
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_relevance
+from rss_sources import (
+    BATCH_RELEVANCE, FOCUS_CATEGORIES, KEYWORD_MATCHER, classify_relevance_batch, get_all_feed_urls,
+    is_relevant_to_citizen
+)
+from text_normalize import term_text
+
+# (text, keyword, should it match) - word boundaries, stemming and spelling variants
+KNOWN_MATCHES = [
+    ('So far the team has played well', 'fare', False),
+    ('Metro fares go up from Monday', 'fare', True),
+    ('Rap star releases new album', 'rape', False),
+    ('Coffee festival draws crowds', 'fee', False),
+    ('School fee hike angers parents', 'fee', True),
+    ('Private schools raise fees again', 'fee', True),
+    ('New taxes on fuel', 'tax', True),
+    ('Minister said the plan is ready', 'ai', False),
+    ('नौकरी पाने के लिए लंबी कतार', 'पानी', False),
+    ('शहर में पानी की किल्लत', 'पानी', True),
+    ('बढ़ती कीमतों से लोग परेशान', 'कीमत', True),
+    ('बाढ़ से तबाही', 'बाढ़', True),
+    ('बा\u095d से तबाही', 'बाढ़', True),  # precomposed ढ़ (U+095D)
+    ('बाढ से तबाही', 'बाढ़', True),  # nukta left out
+    ('Supreme Court admits PIL on air quality', 'PIL', True),
+]
+
+FILLER = (
+    "the a of in to and for on with said government new after minister state "
+    "india people year will from at by over amid says first two more than "
+    "देश में के की और से पर लिए बाद सरकार लोगों"
+).split()
+
+
+def legacy_is_relevant(title, description):
+    """The original O(categories x keywords) substring loop, kept for comparison"""
+    text = f"{title} {description}".lower()
+    best_match = None
+    best_score = 0
+    for category_key, category_data in FOCUS_CATEGORIES.items():
+        matches = sum(1 for kw in category_data['keywords'] if kw in text)
+        weighted_score = matches * category_data.get('weight', 1.0)
+        if weighted_score > best_score:
+            best_score = weighted_score
+            best_match = category_key
+    if best_match and best_score >= 1:
+        return True, best_match, best_score
+    return False, None, 0
+
+
+def synthetic_headlines(n, seed=42):
+    """Headline-shaped text: mostly filler with the odd category keyword"""
+    rng = random.Random(seed)
+    keywords = [kw for data in FOCUS_CATEGORIES.values() for kw in data['keywords']]
+    corpus = []
+    for _ in range(n):
+        title = ' '.join(rng.choice(keywords if rng.random() < 0.1 else FILLER)
+                         for _ in range(rng.randint(8, 14)))
+        description = ' '.join(rng.choice(keywords if rng.random() < 0.05 else FILLER)
+                               for _ in range(rng.randint(25, 45)))
+        corpus.append((title, description))
+    return corpus
+
+
+def live_headlines():
+    """Pull current headlines from every curated feed"""
+    import feedparser
+    import requests
+
+    corpus = []
+    for feed in get_all_feed_urls():
+        try:
+            response = requests.get(feed['url'], headers={'User-Agent': 'NirvanaRead/1.0'}, timeout=8)
+            for entry in feedparser.parse(response.content).entries:
+                description = re.sub(r'<[^>]+>', '', entry.get('summary', '')).strip()[:300]
+                corpus.append((entry.get('title', '').strip(), description))
+            print(f"  ✓ {feed['source_name']}")
+        except Exception as e:
+            print(f"  ✗ {feed['source_name']}: {str(e)}")
+    return corpus
+
+
+def load_headlines(path):
+    corpus = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            title, _, description = line.rstrip('\n').partition('\t')
+            corpus.append((title, description))
+    return corpus
+
+
+def save_headlines(path, corpus):
+    with open(path, 'w', encoding='utf-8') as f:
+        for title, description in corpus:
+            f.write(f"{title.replace(chr(9), ' ')}\t{description.replace(chr(9), ' ')}\n")
+
+
+def check_known_matches():
+    """Number of KNOWN_MATCHES the matcher gets wrong (each one printed)"""
+    wrong = 0
+    for text, keyword, expected in KNOWN_MATCHES:
+        if (term_text(keyword) in KEYWORD_MATCHER.matched_keywords(term_text(text))) != expected:
+            print(f"  ✗ {keyword!r} {'missed in' if expected else 'matched in'} {text!r}")
+            wrong += 1
+    return wrong
+
+
+def check_numpy_branch(corpus):
+    """Headlines where the NumPy and pure-Python classifiers disagree (0 without NumPy)"""
+    if batch_relevance.np is None:
+        print("  (NumPy not installed - only the pure-Python classifier was checked)")
+        return 0
+    matched = [KEYWORD_MATCHER.matched_keywords(term_text(f"{t} {d}")) for t, d in corpus]
+    numpy_categories, numpy_confidences = BATCH_RELEVANCE._classify_numpy(matched)
+    python_categories, python_confidences = BATCH_RELEVANCE._classify_python(matched)
+    return sum(1 for a, b, c, d in zip(numpy_categories, python_categories, numpy_confidences, python_confidences)
+               if a != b or c != d)
+
+
+def bench(fn, corpus, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for title, description in corpus:
+            fn(title, description)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_batch(corpus, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        classify_relevance_batch(corpus)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--headlines', help='TSV file of title<TAB>description')
+    parser.add_argument('--live', action='store_true', help='fetch real headlines from CURATED_SOURCES')
+    parser.add_argument('--save', help='write the corpus used to this TSV file')
+    parser.add_argument('-n', type=int, default=3000, help='synthetic corpus size')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.headlines:
+        corpus = load_headlines(args.headlines)
+    elif args.live:
+        corpus = live_headlines()
+    else:
+        corpus = synthetic_headlines(args.n)
+
+    if args.save:
+        save_headlines(args.save, corpus)
+
+    # Batch and single must give the same answers or the benchmark is meaningless
+    categories, confidences = classify_relevance_batch(corpus)
+    mismatches = sum(1 for (t, d), category, confidence in zip(corpus, categories, confidences)
+                      if is_relevant_to_citizen(t, d) != (category is not None, category, confidence))
+    mismatches += check_known_matches()
+    mismatches += check_numpy_branch(corpus)
+    legacy_relevant = sum(1 for t, d in corpus if legacy_is_relevant(t, d)[0])
+    differs = sum(1 for t, d in corpus if legacy_is_relevant(t, d) != is_relevant_to_citizen(t, d))
+
+    legacy = bench(legacy_is_relevant, corpus, args.repeat)
+    compiled = bench(is_relevant_to_citizen, corpus, args.repeat)
+    batch = bench_batch(corpus, args.repeat)
+
+    print(f"📚 {len(corpus)} headlines, best of {args.repeat}")
+    print(f"  legacy loop : {legacy * 1000:8.1f} ms  ({legacy / len(corpus) * 1e6:6.1f} µs/article)")
+    print(f"  compiled    : {compiled * 1000:8.1f} ms  ({compiled / len(corpus) * 1e6:6.1f} µs/article)")
+    print(f"  batch ({'numpy' if batch_relevance.np is not None else 'python'}) : "
+          f"{batch * 1000:8.1f} ms  ({batch / len(corpus) * 1e6:6.1f} µs/article)")
+    print(f"  speedup     : {legacy / compiled:.2f}x single, {legacy / batch:.2f}x batch, mismatches: {mismatches}")
+    print(f"  relevant    : {sum(1 for c in categories if c)} (legacy substring match: {legacy_relevant}), "
+          f"{differs} headlines classified differently")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
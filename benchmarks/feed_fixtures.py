@@ -0,0 +1,253 @@
+"""
+=============================================================================
+NIRVANA READ - Recorded Feed Fixtures
+One RSS body per CURATED_SOURCES feed in benchmarks/fixtures/, replayed by a
+local HTTP server (ETag / 304 aware) with publish dates shifted to "now" so
+the freshness window keeps them alive.
+
+Usage:
+    python benchmarks/feed_fixtures.py --record       # overwrite with live feeds
+    python benchmarks/feed_fixtures.py --synthesize   # deterministic stand-ins
+    python benchmarks/feed_fixtures.py --serve --port 8765
+=============================================================================
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rss_sources import CURATED_SOURCES, FOCUS_CATEGORIES, get_all_feed_urls
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+DATE_TAGS = re.compile(rb'<(pubDate|dc:date|published|updated)>([^<]+)</\1>')
+
+# Keyword-free on purpose: relevance only comes from the inserted focus keywords
+FILLER = {
+    'english': (
+        "the a of in to and for on with said government new after minister state "
+        "india people year will from at by over amid says first two more than "
+        "officials district city report week centre plan statement"
+    ).split(),
+    'hindi': (
+        "देश में के की और से पर लिए बाद सरकार लोगों मंत्री राज्य जिले शहर "
+        "रिपोर्ट सप्ताह हफ्ते केंद्र बयान घोषणा नए पहले दो साल"
+    ).split()
+}
+
+
+def fixture_name(feed):
+    return f"{feed['source_key']}-{feed['feed_key']}.xml"
+
+
+def load_fixtures(fixture_dir=FIXTURE_DIR):
+    """{fixture name: body bytes} for every curated feed; raises if one is missing"""
+    fixtures = {}
+    for feed in get_all_feed_urls():
+        with open(os.path.join(fixture_dir, fixture_name(feed)), 'rb') as f:
+            fixtures[fixture_name(feed)] = f.read()
+    return fixtures
+
+
+def shift_dates(body, now=None):
+    """Move every publish date by the same offset so the newest entry is a few minutes old"""
+    now = now or datetime.now(timezone.utc)
+    dates = []
+    for match in DATE_TAGS.finditer(body):
+        try:
+            dates.append(_parse_date(match.group(2).decode().strip()))
+        except (TypeError, ValueError):
+            continue
+    if not dates:
+        return body
+
+    offset = now - timedelta(minutes=5) - max(dates)
+
+    def shifted(match):
+        tag, value = match.group(1), match.group(2).decode().strip()
+        try:
+            moved = _parse_date(value) + offset
+        except (TypeError, ValueError):
+            return match.group(0)
+        text = format_datetime(moved) if tag == b'pubDate' else moved.strftime('%Y-%m-%dT%H:%M:%SZ')
+        return b'<%s>%s</%s>' % (tag, text.encode(), tag)
+
+    return DATE_TAGS.sub(shifted, body)
+
+
+def _parse_date(value):
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def synthesize_fixture(feed, items=30, recorded_at=datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)):
+    """Deterministic RSS 2.0 body shaped like the real feed (language, focus categories)"""
+    rng = random.Random(fixture_name(feed))
+    language = feed['language']
+    filler = FILLER[language]
+    hindi = language == 'hindi'
+    keywords = [
+        kw for category in feed['focus_areas'] for kw in FOCUS_CATEGORIES[category]['keywords']
+        if any('ऀ' <= ch <= 'ॿ' for ch in kw) == hindi
+    ]
+
+    entries = []
+    for i in range(items):
+        # Roughly half the entries carry a focus keyword, like a real front page
+        words = [rng.choice(filler) for _ in range(rng.randint(8, 13))]
+        if rng.random() < 0.55:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        title = ' '.join(words).capitalize()
+        body_words = [rng.choice(keywords if rng.random() < 0.01 else filler) for _ in range(rng.randint(30, 55))]
+        description = f"<p>{escape(' '.join(body_words))}.</p>"
+        published = recorded_at - timedelta(minutes=rng.randint(20, 70) * i)
+        link = f"https://example.org/{feed['source_key']}/{feed['feed_key']}/{i}"
+        entries.append(
+            f"<item><title>{escape(title)}</title><link>{link}</link>"
+            f"<guid isPermaLink=\"true\">{link}</guid>"
+            f"<description><![CDATA[{description}]]></description>"
+            f"<pubDate>{format_datetime(published)}</pubDate></item>"
+        )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+        f"<title>{escape(feed['source_name'])}</title><link>https://example.org/{feed['source_key']}</link>"
+        f"<description>Synthetic stand-in for {escape(feed['url'])}</description>"
+        + '\n'.join(entries) + '</channel></rss>\n'
+    ).encode('utf-8')
+
+
+def record_fixtures(fixture_dir=FIXTURE_DIR, synthesize=False):
+    """Save the current body of every curated feed (or a synthetic stand-in)"""
+    import requests
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    for feed in get_all_feed_urls():
+        if synthesize:
+            body = synthesize_fixture(feed)
+        else:
+            try:
+                response = requests.get(feed['url'], headers={'User-Agent': 'NirvanaRead/1.0'}, timeout=15)
+                response.raise_for_status()
+                body = response.content
+            except Exception as e:
+                print(f"  ✗ {feed['source_name']}: {str(e)}")
+                continue
+        with open(os.path.join(fixture_dir, fixture_name(feed)), 'wb') as f:
+            f.write(body)
+        print(f"  ✓ {fixture_name(feed)} ({len(body) / 1024:.1f} KB)")
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    fixtures = {}  # name -> (body, etag)
+    latency = 0.0
+
+    stats_lock = threading.Lock()
+    stats = {'requests': 0, 'not_modified': 0, 'bytes': 0}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        name, _, query = self.path.lstrip('/').partition('?')
+        if name not in self.fixtures:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        body, etag = self.fixtures[name]
+        # ?fresh disables 304s, for benchmarks that must parse every time
+        if 'fresh' not in query and self.headers.get('If-None-Match') == etag:
+            with self.stats_lock:
+                self.stats['requests'] += 1
+                self.stats['not_modified'] += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            self.stats['bytes'] += len(body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Streaming parsers hang up once they have enough
+
+
+def start_fixture_server(fixtures, port=0, latency=0.0):
+    """Serve {name: body} with dates shifted to now; returns (server, base_url)"""
+    now = datetime.now(timezone.utc)
+    prepared = {}
+    for name, body in fixtures.items():
+        body = shift_dates(body, now)
+        prepared[name] = (body, '"%s"' % hashlib.sha1(body).hexdigest()[:16])
+
+    handler = type('Handler', (FixtureHandler,), {
+        'fixtures': prepared,
+        'latency': latency,
+        'stats': {'requests': 0, 'not_modified': 0, 'bytes': 0}
+    })
+    # All interfaces so every feed can get its own 127.0.0.N host (per-host limits)
+    server = ThreadingHTTPServer(('0.0.0.0', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def point_sources_at(server):
+    """Rewrite CURATED_SOURCES in place so every feed URL hits the fixture server"""
+    for i, feed in enumerate(get_all_feed_urls()):
+        CURATED_SOURCES[feed['source_key']]['feeds'][feed['feed_key']] = (
+            f"http://127.0.0.{i % 250 + 1}:{server.server_port}/{fixture_name(feed)}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=FIXTURE_DIR)
+    parser.add_argument('--record', action='store_true', help='download every curated feed')
+    parser.add_argument('--synthesize', action='store_true', help='write deterministic synthetic fixtures')
+    parser.add_argument('--serve', action='store_true', help='replay the fixtures over HTTP')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per feed response')
+    args = parser.parse_args()
+
+    if args.record or args.synthesize:
+        record_fixtures(args.dir, synthesize=args.synthesize)
+
+    if args.serve:
+        server, url = start_fixture_server(load_fixtures(args.dir), args.port, args.latency)
+        print(f"📡 Replaying {len(server.RequestHandlerClass.fixtures)} feeds on {url}/<source>-<feed>.xml")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
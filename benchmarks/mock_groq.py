@@ -0,0 +1,114 @@
+"""
+=============================================================================
+NIRVANA READ - Mock Groq Chat Completions Server
+Answers batch scoring prompts with deterministic scores, optional latency
+and periodic 429s with Retry-After, so AI scoring can run offline.
+
+Usage:
+    python benchmarks/mock_groq.py --port 8099 --latency 0.3 --rate-limit-every 5
+    GROQ_API_KEY=test GROQ_API_URL=http://127.0.0.1:8099/openai/v1/chat/completions python app.py
+=============================================================================
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockGroqHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    rate_limit_every = 0  # 0 = never answer 429
+    retry_after = 1
+
+    stats_lock = threading.Lock()
+    stats = {'requests': 0, 'rate_limited': 0, 'items_scored': 0}
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            count = self.stats['requests']
+        if self.rate_limit_every and count % self.rate_limit_every == 0:
+            with self.stats_lock:
+                self.stats['rate_limited'] += 1
+            self._send_json(429, {'error': {'message': 'Rate limit reached'}},
+                            {'Retry-After': str(self.retry_after)})
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        prompt = request['messages'][-1]['content']
+        item_ids = [int(n) for n in re.findall(r'^\[(\d+)\]$', prompt, re.MULTILINE)] or [1]
+        titles = re.findall(r'^\*\*Title\*\*: (.*)$', prompt, re.MULTILINE)
+
+        results = []
+        for item_id, title in zip(item_ids, titles or ['']):
+            # Stable per-title scores so runs are comparable
+            seed = hashlib.md5(title.encode()).digest()
+            results.append({
+                'id': item_id,
+                'direct_impact': 40 + seed[0] % 60,
+                'urgency': 40 + seed[1] % 60,
+                'actionability': 40 + seed[2] % 60,
+                'citizen_relevance': 40 + seed[3] % 60,
+                'reasoning': f'Mock assessment of item {item_id}'
+            })
+        with self.stats_lock:
+            self.stats['items_scored'] += len(results)
+
+        content = json.dumps(results)
+        self._send_json(200, {'choices': [{'message': {'role': 'assistant', 'content': content}}]})
+
+
+def start_mock_groq(port=0, latency=0.0, rate_limit_every=0, retry_after=1):
+    """Start the mock in a daemon thread; returns (server, chat_completions_url)"""
+    handler = type('Handler', (MockGroqHandler,), {
+        'latency': latency,
+        'rate_limit_every': rate_limit_every,
+        'retry_after': retry_after,
+        'stats': {'requests': 0, 'rate_limited': 0, 'items_scored': 0}
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/openai/v1/chat/completions'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency', type=float, default=0.3, help='seconds per completion')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='answer every Nth request with 429')
+    parser.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args()
+
+    server, url = start_mock_groq(args.port, args.latency, args.rate_limit_every, args.retry_after)
+    print(f"🤖 Mock Groq listening on {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+=============================================================================
+NIRVANA READ - Copy-on-Write Cache Snapshot
+One immutable object per publish (items, index, serialized responses,
+timestamp, version). The refresher swaps the module-level reference;
+readers just grab it - no lock, no copy.
+=============================================================================
+"""
+
+from article_store import rank_key
+from news_index import NewsIndex
+from response_cache import ResponseCache
+
+
+class CacheSnapshot:
+    """Everything readers need from one cache publish - never mutated after creation"""
+
+    __slots__ = ('items', 'index', 'responses', 'timestamp', 'version')
+
+    def __init__(self, items, timestamp=None, version=0, previous=None):
+        # Canonical order (also what /api/news cursors page through), whatever the source
+        self.items = tuple(sorted(items, key=rank_key))
+        # Items carried over from `previous` keep their already-normalized search terms
+        self.index = NewsIndex(self.items, previous.index if previous is not None else None)
+        # Only memoizes serialized bodies of this snapshot's own items
+        self.responses = ResponseCache()
+        self.timestamp = timestamp
+        self.version = version
+
+    def __len__(self):
+        return len(self.items)
@@ -0,0 +1,81 @@
+"""
+=============================================================================
+NIRVANA READ - Streamed Exports
+CSV / JSON Lines bodies produced row by row from any iterable of news
+items, optionally gzip-compressed on the fly, so an export of the whole
+archive never sits in memory and the first bytes leave immediately
+=============================================================================
+"""
+
+import csv
+import zlib
+
+from response_cache import dumps
+
+CSV_COLUMNS = (
+    ('Title', 'title'),
+    ('Category', 'category'),
+    ('Source', 'source'),
+    ('Language', 'language'),
+    ('Score', 'score'),
+    ('AI Reasoning', 'reasoning'),
+    ('Time', 'publishedAtIST'),
+    ('URL', 'url'),
+)
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson; charset=utf-8', 'jsonl'),
+}
+
+# Rows are sent in chunks of about this size rather than one write per row
+CHUNK_BYTES = 16 * 1024
+
+
+class _LineBuffer:
+    """csv.writer target that hands back each formatted row instead of storing it"""
+
+    def write(self, line):
+        return line
+
+
+def iter_csv(items):
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow([header for header, _ in CSV_COLUMNS]).encode('utf-8')
+    for item in items:
+        yield writer.writerow([item.get(key, '') for _, key in CSV_COLUMNS]).encode('utf-8')
+
+
+def iter_jsonl(items):
+    for item in items:
+        yield dumps(item) + b'\n'
+
+
+def iter_chunks(lines, chunk_bytes=CHUNK_BYTES):
+    """Join small lines into ~chunk_bytes pieces"""
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def iter_gzip(chunks, level=6):
+    """Compress a byte stream into one gzip member as it goes"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(items, fmt='csv', compress=False):
+    """Body chunks of an export of `items` in `fmt` ('csv' / 'jsonl')"""
+    lines = iter_csv(items) if fmt == 'csv' else iter_jsonl(items)
+    chunks = iter_chunks(lines)
+    return iter_gzip(chunks) if compress else chunks
@@ -0,0 +1,90 @@
+"""
+=============================================================================
+NIRVANA READ - Conditional GET Feed Cache
+Per-feed ETag / Last-Modified validators plus the items parsed from the last
+200 response, so a 304 can reuse them. Persisted as JSON across restarts.
+=============================================================================
+"""
+
+import json
+import os
+import threading
+
+# Bump when parse_feed_content output changes (fields, relevance matching)
+# so stale items are dropped
+FEED_CACHE_VERSION = 3
+
+_FEEDS = {}  # feed_url -> {'etag', 'last_modified', 'items'}
+_LOCK = threading.Lock()
+
+
+def conditional_headers(feed_url):
+    """If-None-Match / If-Modified-Since headers for a feed we have items for"""
+    with _LOCK:
+        entry = _FEEDS.get(feed_url)
+
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def store_validators(feed_url, etag, last_modified, items):
+    """Remember validators + parsed items from a 200 response"""
+    with _LOCK:
+        if etag or last_modified:
+            _FEEDS[feed_url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                # 'terms' is cheap to recompute and would double the file
+                'items': [{k: v for k, v in item.items() if k != 'terms'} for item in items]
+            }
+        else:
+            # Nothing to revalidate with - don't keep items around
+            _FEEDS.pop(feed_url, None)
+
+
+def get_unchanged_items(feed_url):
+    """Items parsed the last time this feed returned 200 (for a 304)"""
+    with _LOCK:
+        entry = _FEEDS.get(feed_url)
+        return list(entry['items']) if entry else []
+
+
+def load_feed_cache(path):
+    """Load validators saved by a previous run; ignores missing/old files"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return 0
+    except Exception as e:
+        print(f"⚠️ Could not load feed cache {path}: {str(e)}")
+        return 0
+
+    if data.get('version') != FEED_CACHE_VERSION:
+        print("⚠️ Feed cache version changed, starting fresh")
+        return 0
+
+    with _LOCK:
+        _FEEDS.clear()
+        _FEEDS.update(data.get('feeds', {}))
+        return len(_FEEDS)
+
+
+def save_feed_cache(path):
+    """Write validators atomically (temp file + rename)"""
+    with _LOCK:
+        data = {'version': FEED_CACHE_VERSION, 'feeds': dict(_FEEDS)}
+
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"⚠️ Could not save feed cache {path}: {str(e)}")
@@ -0,0 +1,109 @@
+"""
+=============================================================================
+NIRVANA READ - Per-Feed Adaptive Refresh Scheduler
+Each feed gets its own poll interval, adapted to how often it publishes,
+with exponential backoff on failures and jitter to spread requests out
+=============================================================================
+"""
+
+import random
+import statistics
+import threading
+import time
+from datetime import datetime
+
+
+class FeedScheduler:
+    """Tracks when each feed is next due; only the refresher calls record_result()"""
+
+    def __init__(self, min_interval=300, max_interval=6 * 3600, initial_interval=1800,
+                 max_backoff=6 * 3600, jitter=0.15):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        self.state = {}  # feed url -> {'interval', 'next_due', 'failures', 'last_polled', 'last_new'}
+
+    def _entry(self, url):
+        if url not in self.state:
+            self.state[url] = {
+                'interval': self.initial_interval,
+                'next_due': 0.0,  # never polled -> due right away
+                'failures': 0,
+                'last_polled': None,
+                'last_new': 0
+            }
+        return self.state[url]
+
+    def _jittered(self, seconds):
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def due_feeds(self, feeds, now=None):
+        """Subset of `feeds` (get_all_feed_urls() entries) whose poll time has come"""
+        now = now or time.time()
+        with self.lock:
+            return [feed for feed in feeds if self._entry(feed['url'])['next_due'] <= now]
+
+    def seconds_until_next(self, feeds, now=None):
+        now = now or time.time()
+        with self.lock:
+            due_times = [self._entry(feed['url'])['next_due'] for feed in feeds]
+        return max(min(due_times) - now, 0) if due_times else self.initial_interval
+
+    def record_result(self, url, success, articles=(), new_count=0, now=None):
+        """Adapt a feed's interval after a poll"""
+        now = now or time.time()
+        with self.lock:
+            entry = self._entry(url)
+            entry['last_polled'] = now
+
+            if not success:
+                # Exponential backoff, interval itself is left alone
+                entry['failures'] += 1
+                delay = min(entry['interval'] * (2 ** entry['failures']), self.max_backoff)
+                entry['next_due'] = now + self._jittered(delay)
+                return
+
+            entry['failures'] = 0
+            entry['last_new'] = new_count
+
+            target = self._publish_gap(articles)
+            if target is None or new_count == 0:
+                # Nothing to go on (or nothing new) -> poll a bit less often
+                target = entry['interval'] * 1.5
+
+            # Smooth so one odd poll doesn't swing the interval wildly
+            interval = 0.5 * entry['interval'] + 0.5 * target
+            entry['interval'] = min(max(interval, self.min_interval), self.max_interval)
+            entry['next_due'] = now + self._jittered(entry['interval'])
+
+    @staticmethod
+    def _publish_gap(articles):
+        """Median seconds between consecutive items' publish times, if we can tell"""
+        times = []
+        for article in articles:
+            try:
+                published = datetime.strptime(article['publishedAt'], '%Y-%m-%dT%H:%M:%SZ')
+                times.append(published.timestamp())
+            except (KeyError, ValueError):
+                continue
+
+        times.sort()
+        gaps = [b - a for a, b in zip(times, times[1:]) if b > a]
+        return statistics.median(gaps) if gaps else None
+
+    def summary(self, now=None):
+        """Per-feed interval / backoff view for /health"""
+        now = now or time.time()
+        with self.lock:
+            return {
+                url: {
+                    'interval_minutes': round(entry['interval'] / 60, 1),
+                    'due_in_minutes': round(max(entry['next_due'] - now, 0) / 60, 1),
+                    'failures': entry['failures'],
+                    'last_new': entry['last_new']
+                }
+                for url, entry in self.state.items()
+            }
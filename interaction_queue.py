@@ -0,0 +1,284 @@
+"""
+=============================================================================
+NIRVANA READ - Asynchronous Interaction Tracking
+/api/track only enqueues; a background flusher drains the bounded queue in
+bulk writes. Events the backend cannot take (down, or the queue is full)
+go to a local JSON Lines spool and are replayed once writes succeed again.
+Every event has an id, so a replayed batch is safe to write twice.
+=============================================================================
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from metrics import TRACKING_EVENTS, TRACKING_FLUSH_SECONDS, TRACKING_QUEUE_DEPTH
+
+
+def new_event(user_id, news_url, action, category, reading_time=0):
+    return {
+        'id': uuid.uuid4().hex,
+        'user_id': user_id,
+        'news_url': news_url,
+        'action': action,
+        'category': category,
+        'reading_time': reading_time,
+        'created_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SQLiteInteractionSink:
+    """Local stand-in for the remote interactions table (tests, benchmarks, dev)"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS interactions (
+                id TEXT PRIMARY KEY,
+                user_id TEXT,
+                news_url TEXT,
+                action TEXT,
+                category TEXT,
+                reading_time REAL,
+                created_at TEXT
+            )
+        ''')
+        self.conn.commit()
+
+    def __call__(self, events):
+        with self.lock:
+            # OR IGNORE: replayed events that already made it in are skipped
+            self.conn.executemany('''
+                INSERT OR IGNORE INTO interactions (id, user_id, news_url, action, category, reading_time, created_at)
+                VALUES (:id, :user_id, :news_url, :action, :category, :reading_time, :created_at)
+            ''', events)
+            self.conn.commit()
+        return True
+
+
+class InteractionQueue:
+    """
+    Bounded in-process queue + flusher thread in front of `sink`, a callable
+    that bulk-writes a list of events (raises or returns False on failure).
+    `spool_dir` may be shared by all workers; each appends to its own file.
+    `on_batch`, if given, sees every batch taken off the queue once (before
+    the sink write, whatever its outcome; replays are not shown again).
+    """
+
+    def __init__(self, sink, spool_dir, max_queue=10000, batch_size=200, flush_interval=2.0,
+                 retry_interval=30.0, on_batch=None):
+        self.sink = sink
+        self.on_batch = on_batch
+        self.spool_dir = spool_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.spool_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.retry_at = 0.0  # while the sink is failing, batches go straight to the spool
+
+    @property
+    def spool_path(self):
+        return os.path.join(self.spool_dir, f'interactions-{os.getpid()}.jsonl')
+
+    def start(self):
+        """Start the flusher (call after forking - one per worker process)"""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def put(self, event):
+        """Never blocks on the backend: 'queued', or 'spooled' when the queue is full"""
+        try:
+            self.queue.put_nowait(event)
+            TRACKING_EVENTS.inc(outcome='queued')
+            return 'queued'
+        except queue.Full:
+            self._spool([event])
+            return 'spooled'
+
+    def flush(self):
+        """Synchronously write everything queued so far; True if nothing had to be spooled"""
+        ok = True
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return ok
+            self._notify(batch)
+            ok = self._write(batch) and ok
+
+    def close(self, timeout=5.0):
+        """Stop the flusher and spool whatever it did not get to (no network on shutdown)"""
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        leftover = self._drain(self.queue.qsize() or 1)
+        if leftover:
+            self._spool(leftover)
+
+    def stats(self):
+        spooled = 0
+        try:
+            for name in os.listdir(self.spool_dir):
+                spooled += os.path.getsize(os.path.join(self.spool_dir, name))
+        except OSError:
+            pass
+        return {
+            'queued': self.queue.qsize(),
+            'spool_bytes': spooled,
+            'backend_ok': time.monotonic() >= self.retry_at
+        }
+
+    # ---- flusher ----
+
+    def _run(self):
+        while not self.stopping.is_set():
+            batch = self._collect()
+            TRACKING_QUEUE_DEPTH.set(self.queue.qsize())
+            if batch:
+                self._notify(batch)
+                self._write(batch)
+            if time.monotonic() >= self.retry_at:
+                self._replay_spools()
+
+    def _collect(self):
+        """Up to batch_size events; waits at most flush_interval for the batch to fill"""
+        deadline = time.monotonic() + self.flush_interval
+        batch = []
+        while len(batch) < self.batch_size and not self.stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+            batch.extend(self._drain(self.batch_size - len(batch)))
+        return batch
+
+    def _drain(self, limit):
+        events = []
+        while len(events) < limit:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _notify(self, events):
+        if self.on_batch is None:
+            return
+        try:
+            self.on_batch(events)
+        except Exception as e:
+            print(f"⚠️ Interaction batch hook failed: {str(e)}")
+
+    def _write(self, events, outcome='flushed'):
+        """Bulk write, or spool on failure (and stop trying for retry_interval)"""
+        if time.monotonic() < self.retry_at:
+            self._spool(events)
+            return False
+
+        start = time.perf_counter()
+        try:
+            ok = self.sink(events) is not False
+        except Exception as e:
+            print(f"⚠️ Interaction write failed ({len(events)} events spooled): {str(e)}")
+            ok = False
+        TRACKING_FLUSH_SECONDS.observe(time.perf_counter() - start)
+
+        if ok:
+            TRACKING_EVENTS.inc(len(events), outcome=outcome)
+            return True
+        TRACKING_EVENTS.inc(len(events), outcome='failed')
+        self.retry_at = time.monotonic() + self.retry_interval
+        self._spool(events)
+        return False
+
+    # ---- spool ----
+
+    def _spool(self, events):
+        if not events:
+            return
+        lines = ''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events)
+        with self.spool_lock:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            with open(self.spool_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+        TRACKING_EVENTS.inc(len(events), outcome='spooled')
+
+    def _claim_spools(self):
+        """
+        Rename spool files this process may replay: its own, and those of
+        workers that have exited. The rename is atomic, so only one claims each.
+        """
+        claimed = []
+        try:
+            names = sorted(os.listdir(self.spool_dir))
+        except OSError:
+            return claimed
+
+        for name in names:
+            path = os.path.join(self.spool_dir, name)
+            try:
+                if name.endswith('.jsonl'):
+                    owner = int(name[len('interactions-'):-len('.jsonl')])
+                elif '.jsonl.replay-' in name:
+                    owner = int(name.rsplit('-', 1)[1])  # crashed mid-replay
+                else:
+                    continue
+            except ValueError:
+                continue
+            if owner != os.getpid() and _pid_alive(owner):
+                continue
+
+            target = os.path.join(self.spool_dir, f'{name.split(".jsonl")[0]}.jsonl.replay-{os.getpid()}')
+            try:
+                with self.spool_lock:
+                    os.rename(path, target)
+            except FileNotFoundError:
+                continue
+            claimed.append(target)
+        return claimed
+
+    def _replay_spools(self):
+        for path in self._claim_spools():
+            with open(path, encoding='utf-8') as f:
+                events = []
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        continue  # torn last line from a crash
+            for i in range(0, len(events), self.batch_size):
+                if not self._write(events[i:i + self.batch_size], outcome='replayed'):
+                    # _write spooled the failed batch; keep the rest too
+                    self._spool(events[i + self.batch_size:])
+                    break
+            os.remove(path)
+            if time.monotonic() < self.retry_at:
+                return
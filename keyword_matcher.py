@@ -0,0 +1,98 @@
+"""
+=============================================================================
+NIRVANA READ - Compiled Keyword Matcher
+All category keywords folded into one trie-shaped regex, built once at import.
+Keywords and texts both go through text_normalize.term_text, so a keyword
+only matches whole (stemmed) words
+=============================================================================
+"""
+
+import re
+
+from text_normalize import term_text
+
+
+def _build_trie(words):
+    """Build a nested-dict character trie ('' marks end of a word)"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_regex(node):
+    """Turn a trie into a regex where shared prefixes are matched only once"""
+    is_end = '' in node
+    branches = [re.escape(ch) + _trie_to_regex(child)
+                for ch, child in sorted(node.items()) if ch]
+
+    if not branches:
+        return ''
+
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # Greedy optional tail => the longest keyword starting here wins
+    return f'(?:{body})?' if is_end else body
+
+
+class KeywordMatcher:
+    """
+    Single-pass multi-keyword matcher.
+
+    Semantics are identical to `sum(1 for kw in keywords if term_text(kw) in text)`
+    per category, for text from term_text: every distinct keyword found in
+    the text (overlaps included) counts once for each category that lists it.
+    Keywords that normalize alike ('price' / 'prices') are one keyword here.
+    """
+
+    def __init__(self, categories):
+        self.category_keys = list(categories.keys())
+
+        # normalized keyword (' supreme court ') -> {category_key: times listed}
+        self.keyword_categories = {}
+        for category_key, category_data in categories.items():
+            for kw in category_data.get('keywords', []):
+                kw = term_text(kw)
+                if kw == ' ':
+                    continue
+                hits = self.keyword_categories.setdefault(kw, {})
+                hits[category_key] = hits.get(category_key, 0) + 1
+
+        keywords = list(self.keyword_categories)
+
+        # The regex only reports the longest keyword at each position, so
+        # remember which shorter keywords are prefixes of it (the spaces
+        # around each keyword keep ' fee ' from being a prefix of ' feed ').
+        self.prefixes = {
+            kw: [other for other in keywords if kw.startswith(other)]
+            for kw in keywords
+        }
+
+        # Zero-width lookahead lets finditer try every start position,
+        # so overlapping keywords ('supreme court' / 'court') are all found.
+        if keywords:
+            self.pattern = re.compile('(?=(' + _trie_to_regex(_build_trie(keywords)) + '))')
+        else:
+            self.pattern = None
+
+    def matched_keywords(self, text):
+        """Set of distinct (normalized) keywords occurring in term_text output"""
+        found = set()
+        if self.pattern is None:
+            return found
+
+        for match in self.pattern.finditer(text):
+            longest = match.group(1)
+            if longest not in found:
+                found.update(self.prefixes[longest])
+        return found
+
+    def category_hits(self, text):
+        """Per-category keyword hit counts for term_text output"""
+        counts = dict.fromkeys(self.category_keys, 0)
+        for kw in self.matched_keywords(text):
+            for category_key, n in self.keyword_categories[kw].items():
+                counts[category_key] += n
+        return counts
@@ -0,0 +1,194 @@
+"""
+=============================================================================
+NIRVANA READ - Pipeline Metrics
+Small in-process counters / gauges / histograms rendered in the Prometheus
+text format for /metrics, plus the refresh pipeline's own metric set
+=============================================================================
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def samples(self):
+        """{label values: value} copy for summaries"""
+        with self.lock:
+            return dict(self.values)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        for key, value in sorted(self.samples().items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Cumulative buckets + sum + count per label set"""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['buckets'][i] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self.lock:
+            return {key: {'buckets': list(state['buckets']), 'sum': state['sum'], 'count': state['count']}
+                    for key, state in self.values.items()}
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        for key, state in sorted(self.samples().items()):
+            for bound, count in zip(self.buckets, state['buckets']):
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, [("le", bound)])} {count}')
+            inf_labels = _format_labels(self.labelnames, key, [('le', '+Inf')])
+            lines.append(f'{self.name}_bucket{inf_labels} {state["count"]}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state["sum"])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {state["count"]}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class StageTimer:
+    """Seconds spent per pipeline stage during one refresh; feed threads add to it concurrently"""
+
+    def __init__(self):
+        self.seconds = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self.lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def time(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def totals(self):
+        with self.lock:
+            return dict(self.seconds)
+
+
+REGISTRY = Registry()
+
+# ---- Refresh pipeline ----
+REFRESH_SECONDS = REGISTRY.register(Histogram(
+    'nirvana_refresh_seconds', 'Wall time of a whole fetch_and_score_news run'))
+REFRESH_STAGE_SECONDS = REGISTRY.register(Histogram(
+    'nirvana_refresh_stage_seconds',
+    'Seconds per refresh spent in each stage (parse/filter/personalize summed over feeds and articles)',
+    labels=('stage',)))
+REFRESH_ARTICLES = REGISTRY.register(Gauge(
+    'nirvana_refresh_articles', 'Article counts from the last refresh', labels=('stat',)))
+
+# ---- Feeds ----
+FEED_FETCH_SECONDS = REGISTRY.register(Histogram(
+    'nirvana_feed_fetch_seconds', 'Per-feed fetch + parse latency', labels=('source',)))
+FEED_FETCHES = REGISTRY.register(Counter(
+    'nirvana_feed_fetches_total', 'Feed fetches by outcome (ok, timeout, error)', labels=('source', 'outcome')))
+FEED_NOT_MODIFIED = REGISTRY.register(Counter(
+    'nirvana_feed_not_modified_total', 'Feed fetches answered with 304 Not Modified', labels=('source',)))
+FEED_BYTES = REGISTRY.register(Counter(
+    'nirvana_feed_bytes_total', 'Feed body bytes read (streaming stops early)', labels=('source',)))
+
+# ---- AI scoring ----
+AI_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'nirvana_ai_request_seconds', 'Latency of Groq scoring calls'))
+AI_REQUESTS = REGISTRY.register(Counter(
+    'nirvana_ai_requests_total', 'Groq scoring calls by HTTP status (or timeout / error)', labels=('status',)))
+
+# ---- Interaction tracking ----
+TRACKING_EVENTS = REGISTRY.register(Counter(
+    'nirvana_tracking_events_total',
+    'Interaction events by outcome (queued, spooled, flushed, replayed, failed)', labels=('outcome',)))
+TRACKING_FLUSH_SECONDS = REGISTRY.register(Histogram(
+    'nirvana_tracking_flush_seconds', 'Latency of one bulk write of interaction events'))
+TRACKING_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'nirvana_tracking_queue_depth', 'Interaction events waiting in this worker\'s queue'))
@@ -0,0 +1,142 @@
+"""
+=============================================================================
+NIRVANA READ - Read-Optimised News Index
+Built once per cache publish: category / language posting lists and
+normalized search terms, so /api/news only touches matching items
+=============================================================================
+"""
+
+from bisect import bisect_right
+
+from text_normalize import joined, stem, tokens
+
+
+class NewsIndex:
+    """Immutable index over a score-ordered list of news items"""
+
+    def __init__(self, items, previous=None):
+        """
+        `previous` is the index this one replaces; search text of items it had
+        with the same title and description is reused
+        """
+        self.items = items
+        self.by_category = {}
+        self.by_language = {}
+        # Per item, title + description as (stemmed terms, unstemmed words), each
+        # joined by text_normalize.joined
+        self.search_text = []
+        # Parallel arrays for per-user re-ranking without touching the item dicts
+        self.scores = [item['score'] for item in items]
+        self.categories = [item['categoryKey'] for item in items]
+        self.ids = [item['id'] for item in items]
+
+        known = previous.search_text_by_content() if previous is not None else {}
+        for position, item in enumerate(items):
+            self.by_category.setdefault(item['categoryKey'], []).append(position)
+            self.by_language.setdefault(item['language'], []).append(position)
+            # The id is the url's hash: a headline edited at the same url is new text
+            text = known.get((item['id'], item['title'], item['description']))
+            if text is None:
+                # Not cached on the published item itself - it would ride along in every response
+                words = tokens(f"{item['title']} {item['description']}")
+                text = (joined([stem(word) for word in words]), joined(words))
+            self.search_text.append(text)
+
+    def __len__(self):
+        return len(self.items)
+
+    def search_text_by_content(self):
+        return {
+            (item['id'], item['title'], item['description']): text
+            for item, text in zip(self.items, self.search_text)
+        }
+
+    def query(self, category=None, language=None, search='', boosts=None):
+        """
+        Items matching every given filter, in score order.
+        `search` is normalized like the items' text; 'all' / empty filters are ignored.
+        `boosts` ({category: multiplier}) re-ranks by score x multiplier.
+        """
+        if boosts:
+            return self.page(category, language, search, boosts, limit=None)[0]
+
+        positions = self.positions(category, language, search)
+        if positions is None:
+            return self.items
+        return [self.items[pos] for pos in positions]
+
+    def page(self, category=None, language=None, search='', boosts=None, limit=50, after=None):
+        """
+        One page in (score desc, id) order - score x boost when personalized:
+        (items, (score, id) of the last item or None if nothing follows,
+        number of matching items).
+        `after` is such a pair from an earlier page. It is a position in the
+        ordering, not in this snapshot, so it stays valid across cache swaps.
+        """
+        positions = self.positions(category, language, search)
+        if positions is None:
+            positions = range(len(self.items))
+
+        scores, categories, ids = self.scores, self.categories, self.ids
+        boosts = boosts or {}
+        # At most 150 items; a snapshot restored from an older file may not be in id order within ties
+        keyed = sorted((-scores[pos] * boosts.get(categories[pos], 1.0), ids[pos], pos) for pos in positions)
+
+        start = bisect_right(keyed, (-after[0], after[1], float('inf'))) if after else 0
+        end = len(keyed) if limit is None else start + limit
+        selected = keyed[start:end]
+
+        next_after = None
+        if end < len(keyed) and selected:
+            next_after = (-selected[-1][0], selected[-1][1])
+        return [self.items[pos] for _, _, pos in selected], next_after, len(keyed)
+
+    def category_counts(self):
+        """{categoryKey: {name, name_hi, count}} over the whole snapshot, for filter menus"""
+        return {
+            category: {
+                'name': self.items[positions[0]]['category'],
+                'name_hi': self.items[positions[0]]['category_hi'],
+                'count': len(positions)
+            }
+            for category, positions in self.by_category.items()
+        }
+
+    def positions(self, category=None, language=None, search=''):
+        """
+        Positions (in score order) of the items matching the filters; None means all of them.
+        Search words must match whole (stemmed) words of the item; the last
+        one may still be being typed, so it may also start a word ('petro').
+        """
+        query = tokens(search) if search else []
+        if search.strip() and not query:
+            # Only punctuation ('!!!', '-'): nothing can match it
+            return []
+        search = query
+        postings = []
+        if category and category != 'all':
+            postings.append(self.by_category.get(category, []))
+        if language and language != 'all':
+            postings.append(self.by_language.get(language, []))
+
+        if postings:
+            # Walk the shortest list, check membership in the others
+            postings.sort(key=len)
+            others = [set(p) for p in postings[1:]]
+            positions = [pos for pos in postings[0] if all(pos in other for other in others)]
+        elif not search:
+            return None
+        else:
+            positions = range(len(self.items))
+
+        if search:
+            search_text = self.search_text
+            whole = [f' {stem(word)} ' for word in search]
+            last_term, last_prefix = whole.pop(), f' {search[-1]}'
+            positions = [
+                pos for pos in positions
+                if all(term in search_text[pos][0] for term in whole)
+                and (last_term in search_text[pos][0] or last_prefix in search_text[pos][1])
+            ]
+
+        return positions
@@ -0,0 +1,142 @@
+"""
+=============================================================================
+NIRVANA READ - Server-Sent Events for Snapshot Deltas
+Each publish is diffed against the previous snapshot once (added, updated,
+removed); every connected client gets the part its filters select. Buffers
+are bounded - a client that falls behind is told to reload, not queued for.
+=============================================================================
+"""
+
+import queue
+import threading
+import time
+
+from response_cache import dumps
+
+
+def snapshot_delta(old, new):
+    """(added, updated, removed ids) between two snapshots; updated = new score or alternates"""
+    old_items = {item['id']: item for item in old.items}
+    added, updated = [], []
+    for item in new.items:
+        previous = old_items.pop(item['id'], None)
+        if previous is None:
+            added.append(item)
+        elif previous['score'] != item['score'] or previous.get('alternates') != item.get('alternates'):
+            updated.append(item)
+    return added, updated, list(old_items)
+
+
+def sse_event(event, data, event_id=None):
+    lines = f'id: {event_id}\n' if event_id is not None else ''
+    return f'{lines}event: {event}\ndata: '.encode() + dumps(data) + b'\n\n'
+
+
+class Subscriber:
+    """One SSE connection: its filters and a bounded buffer of encoded events"""
+
+    def __init__(self, category=None, language=None, search='', fields=None, buffer_size=16):
+        self.category = category
+        self.language = language
+        self.search = search
+        self.fields = fields
+        self.buffer = queue.Queue(maxsize=buffer_size)
+
+    def push(self, event):
+        """Never blocks the publisher; on overflow the client gets one 'reset' instead"""
+        try:
+            self.buffer.put_nowait(event)
+        except queue.Full:
+            while True:
+                try:
+                    self.buffer.get_nowait()
+                except queue.Empty:
+                    break
+            self.buffer.put_nowait(sse_event('reset', {'reason': 'behind'}))
+
+    def project(self, items):
+        if not self.fields:
+            return list(items)
+        return [{f: item[f] for f in self.fields if f in item} for item in items]
+
+
+class NewsStream:
+    """Per-process hub: request threads subscribe, the snapshot swap publishes"""
+
+    def __init__(self, max_clients=24, buffer_size=16, heartbeat=15.0, max_seconds=1800):
+        self.max_clients = max_clients
+        self.buffer_size = buffer_size
+        self.heartbeat = heartbeat
+        self.max_seconds = max_seconds  # clients reconnect (Last-Event-ID) and free the thread
+        self.subscribers = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self, **filters):
+        """A new Subscriber, or None when this process already streams to max_clients"""
+        with self.lock:
+            if len(self.subscribers) >= self.max_clients:
+                return None
+            subscriber = Subscriber(buffer_size=self.buffer_size, **filters)
+            self.subscribers.add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, old, new):
+        """Queue the delta from snapshot `old` to `new` for every subscriber"""
+        with self.lock:
+            subscribers = list(self.subscribers)
+        if not subscribers:
+            return
+
+        added, updated, removed = snapshot_delta(old, new)
+        if not (added or updated or removed):
+            return
+
+        for subscriber in subscribers:
+            positions = new.index.positions(subscriber.category, subscriber.language, subscriber.search)
+            if positions is None:
+                selected_added, selected_updated, total = added, updated, len(new)
+            else:
+                wanted = {new.items[pos]['id'] for pos in positions}
+                selected_added = [item for item in added if item['id'] in wanted]
+                selected_updated = [item for item in updated if item['id'] in wanted]
+                total = len(wanted)
+
+            subscriber.push(sse_event('delta', {
+                'version': new.version,
+                'added': subscriber.project(selected_added),
+                'updated': subscriber.project(selected_updated),
+                'removed': removed,
+                'total': total,
+                'cached_at': new.timestamp.isoformat() if new.timestamp else None
+            }, event_id=new.version))
+
+    def events(self, subscriber, version, last_seen=None):
+        """
+        SSE body for one client. `version` is the snapshot it is served from;
+        a client whose data (`last_seen`, or Last-Event-ID on reconnect) is older
+        gets 'reset'. Newer is fine: this worker has yet to load that snapshot.
+        """
+        try:
+            yield b'retry: 5000\n\n'
+            if last_seen is not None and last_seen < version:
+                yield sse_event('reset', {'reason': 'missed', 'version': version}, event_id=version)
+            else:
+                yield sse_event('hello', {'version': version}, event_id=version)
+
+            deadline = time.monotonic() + self.max_seconds
+            while time.monotonic() < deadline:
+                try:
+                    yield subscriber.buffer.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    # Comment line: keeps proxies from closing an idle connection
+                    yield b': keepalive\n\n'
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self):
+        with self.lock:
+            return {'clients': len(self.subscribers), 'max_clients': self.max_clients}
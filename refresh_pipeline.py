@@ -0,0 +1,148 @@
+"""
+=============================================================================
+NIRVANA READ - Staged Refresh Pipeline
+Stages joined by bounded queues, each with its own worker threads. A full
+queue blocks whoever feeds it (backpressure): a slow AI stage holds back
+triage instead of piling up articles, and a slow feed never keeps the
+articles that already arrived from being scored.
+=============================================================================
+"""
+
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class Stage:
+    """
+    `handle(item, emit)` runs on `workers` threads; `emit(x)` hands x to the
+    next stage (blocking while its queue is full). With batch_size > 1,
+    `handle` gets a list of up to batch_size items, waiting at most
+    batch_wait seconds for a batch to fill.
+    """
+
+    def __init__(self, name, handle, workers=1, queue_size=64, batch_size=1, batch_wait=0.05):
+        self.name = name
+        self.handle = handle
+        self.workers = workers
+        # Room for every worker's end marker, so handing one back never blocks
+        self.inbox = queue.Queue(maxsize=max(queue_size, workers))
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+
+        self.lock = threading.Lock()
+        self.running = 0
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0  # in handle(), minus time blocked on the next queue
+        self.blocked_seconds = 0.0  # waiting for room downstream
+
+    def take(self):
+        """Next item or batch, or _DONE once upstream has finished"""
+        item = self.inbox.get()
+        if self.batch_size == 1 or item is _DONE:
+            return item
+
+        batch = [item]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            try:
+                item = self.inbox.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _DONE:
+                # Ours to act on after this batch
+                self.inbox.put(_DONE)
+                break
+            batch.append(item)
+        return batch
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'processed': self.processed,
+            'errors': self.errors,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'blocked_seconds': round(self.blocked_seconds, 3)
+        }
+
+
+class Pipeline:
+    """Runs a source iterable through `stages` in order; the last stage's emits are the result"""
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.results = []
+        self.source_seconds = 0.0  # until the source was exhausted (incl. blocking on stage 1)
+
+    def run(self, source):
+        """Push every item of `source` through; returns the results once all stages have drained"""
+        threads = []
+        for position, stage in enumerate(self.stages):
+            stage.running = stage.workers
+            following = self.stages[position + 1] if position + 1 < len(self.stages) else None
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(stage, following),
+                    name=f'pipeline-{stage.name}-{n}', daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        started = time.perf_counter()
+        first = self.stages[0]
+        try:
+            for item in source:
+                first.inbox.put(item)
+        finally:
+            self.source_seconds = time.perf_counter() - started
+            for _ in range(first.workers):
+                first.inbox.put(_DONE)
+            for thread in threads:
+                thread.join()
+        return self.results
+
+    def _work(self, stage, following):
+        blocked = [0.0]
+
+        if following is None:
+            emit = self.results.append
+        else:
+            def emit(item):
+                start = time.perf_counter()
+                following.inbox.put(item)
+                blocked[0] += time.perf_counter() - start
+
+        while True:
+            item = stage.take()
+            if item is _DONE:
+                break
+
+            blocked[0] = 0.0
+            start = time.perf_counter()
+            try:
+                stage.handle(item, emit)
+                failed = False
+            except Exception as e:
+                print(f"    ⚠️ Pipeline stage {stage.name} failed: {str(e)}")
+                failed = True
+            elapsed = time.perf_counter() - start
+
+            with stage.lock:
+                stage.processed += len(item) if stage.batch_size > 1 else 1
+                stage.errors += failed
+                stage.busy_seconds += elapsed - blocked[0]
+                stage.blocked_seconds += blocked[0]
+
+        # The last worker out tells the next stage there is nothing more coming
+        with stage.lock:
+            stage.running -= 1
+            last = stage.running == 0
+        if last and following is not None:
+            for _ in range(following.workers):
+                following.inbox.put(_DONE)
+
+    def stats(self):
+        return {stage.name: stage.stats() for stage in self.stages}
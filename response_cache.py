@@ -0,0 +1,117 @@
+"""
+=============================================================================
+NIRVANA READ - Pre-serialized API Responses
+JSON bodies built once per cache version, stored gzip (and brotli, if
+installed) compressed, with strong per-encoding ETags for 304s
+=============================================================================
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_BYTES = 512
+# Per-request bodies (searches, personalized orders) are used once: compress fast
+ON_DEMAND_GZIP_LEVEL = 1
+ON_DEMAND_BROTLI_QUALITY = 1
+
+
+def dumps(payload):
+    """Serialize to UTF-8 JSON bytes - orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_entry(payload, precompress=True):
+    """
+    Serialize + compress a payload once; returns the cached representation.
+    Without `precompress` only the encoding a client asks for is made, on demand.
+    """
+    body = dumps(payload)
+    digest = hashlib.sha1(body).hexdigest()[:20]
+
+    entry = {'identity': body, 'etag': digest}
+    if not precompress:
+        entry['on_demand'] = len(body) >= MIN_COMPRESS_BYTES
+    elif len(body) >= MIN_COMPRESS_BYTES:
+        entry['gzip'] = gzip.compress(body, compresslevel=6)
+        if brotli is not None:
+            entry['br'] = brotli.compress(body, quality=5)
+    return entry
+
+
+class ResponseCache:
+    """Per-cache-version memo of serialized responses (discarded on the next publish)"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, build_payload, memoize=True):
+        """
+        The entry for `key`, built (and kept, if `memoize`) on a miss. Once the
+        cache is full, misses are built like unmemoized ones: no point
+        precompressing a body that is thrown away after one response.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            full = len(self.entries) >= self.max_entries
+        if entry is not None:
+            return entry
+
+        memoize = memoize and not full
+        # Two threads may build the same entry at once; both results are identical
+        entry = build_entry(build_payload(), precompress=memoize)
+        if memoize:
+            with self.lock:
+                if len(self.entries) < self.max_entries:
+                    self.entries[key] = entry
+        return entry
+
+
+def send_entry(entry, request):
+    """Flask response for a cached entry: best accepted encoding, ETag, 304 support"""
+    accepted = request.accept_encodings
+    on_demand = entry.get('on_demand')
+    if ('br' in entry or (on_demand and brotli is not None)) and accepted['br']:
+        encoding = 'br'
+    elif ('gzip' in entry or on_demand) and accepted['gzip']:
+        encoding = 'gzip'
+    else:
+        encoding = 'identity'
+
+    if encoding not in entry:
+        if encoding == 'br':
+            entry['br'] = brotli.compress(entry['identity'], quality=ON_DEMAND_BROTLI_QUALITY)
+        else:
+            entry['gzip'] = gzip.compress(entry['identity'], compresslevel=ON_DEMAND_GZIP_LEVEL)
+
+    # Strong ETags must differ between encodings of the same body
+    etag = f"{entry['etag']}-{encoding}"
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(entry[encoding], mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
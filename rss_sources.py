@@ -4,6 +4,10 @@ NIRVANA READ - FIXED RSS Sources (Fast & Working Feeds Only)
 =============================================================================
 """
 
+from batch_relevance import BatchRelevance
+from keyword_matcher import KeywordMatcher
+from text_normalize import term_text
+
 # ============== VERIFIED WORKING SOURCES ==============
 CURATED_SOURCES = {
     # ============== ENGLISH SOURCES ==============
@@ -344,20 +348,30 @@ def get_category_keywords(category_key):
     """Get keywords for a specific category"""
     return FOCUS_CATEGORIES.get(category_key, {}).get('keywords', [])
 
+# Built once at import - rebuild if FOCUS_CATEGORIES is changed at runtime
+KEYWORD_MATCHER = KeywordMatcher(FOCUS_CATEGORIES)
+BATCH_RELEVANCE = BatchRelevance(FOCUS_CATEGORIES, KEYWORD_MATCHER)
+
+def get_category_hits(title, description):
+    """
+    Scan title + description once and count keyword hits per category.
+    Returns: {category_key: hit_count}
+    """
+    return KEYWORD_MATCHER.category_hits(term_text(f"{title} {description}"))
+
 def is_relevant_to_citizen(title, description):
     """
     Quick check: Is this news relevant to an average Indian citizen?
     Returns: (is_relevant, matched_category, confidence)
     """
-    text = f"{title} {description}".lower()
+    hits = get_category_hits(title, description)
     
     best_match = None
     best_score = 0
     
     # Check each category
     for category_key, category_data in FOCUS_CATEGORIES.items():
-        keywords = category_data['keywords']
-        matches = sum(1 for kw in keywords if kw in text)
+        matches = hits[category_key]
         
         # Weight by category importance
         weighted_score = matches * category_data.get('weight', 1.0)
@@ -371,3 +385,15 @@ def is_relevant_to_citizen(title, description):
         return True, best_match, best_score
     
     return False, None, 0
+
+def classify_relevance_batch(pairs):
+    """
+    is_relevant_to_citizen for many articles at once.
+    pairs: [(title, description), ...]
+    Returns: (categories, confidences) - category None means not relevant
+    """
+    return BATCH_RELEVANCE.classify([term_text(f"{title} {description}") for title, description in pairs])
+
+def classify_relevance_terms(texts):
+    """classify_relevance_batch for articles whose term_text is already known"""
+    return BATCH_RELEVANCE.classify(texts)
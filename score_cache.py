@@ -0,0 +1,106 @@
+"""
+=============================================================================
+NIRVANA READ - Persistent AI Score Cache
+SQLite store of AI scoring results keyed by a hash of URL+title+description,
+with a TTL and least-recently-used eviction past a size limit
+=============================================================================
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def content_key(article, namespace=''):
+    """Stable key for an article's scored content (namespace = model/prompt version)"""
+    raw = '\n'.join([
+        namespace,
+        article.get('url', ''),
+        article.get('title', ''),
+        article.get('description', '')
+    ])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ScoreCache:
+    """Thread-safe SQLite-backed cache of AI results with TTL + size bound"""
+
+    def __init__(self, path, ttl_hours=96, max_entries=5000):
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS ai_scores (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_ai_scores_last_used ON ai_scores(last_used)')
+        self.conn.commit()
+
+    def get(self, key):
+        """Cached result for key, or None if missing/expired"""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT result FROM ai_scores WHERE key = ? AND created_at >= ?',
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+
+            if row is None:
+                self.counters['misses'] += 1
+                return None
+
+            self.conn.execute('UPDATE ai_scores SET last_used = ? WHERE key = ?', (now, key))
+            self.conn.commit()
+            self.counters['hits'] += 1
+        return json.loads(row[0])
+
+    def put_many(self, entries):
+        """Store [(key, result), ...] and enforce TTL + size limit"""
+        if not entries:
+            return
+
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO ai_scores (key, result, created_at, last_used) VALUES (?, ?, ?, ?)',
+                [(key, json.dumps(result, ensure_ascii=False), now, now) for key, result in entries]
+            )
+            self.counters['stored'] += len(entries)
+
+            evicted = self.conn.execute(
+                'DELETE FROM ai_scores WHERE created_at < ?', (now - self.ttl_seconds,)
+            ).rowcount
+
+            overflow = self.conn.execute('SELECT COUNT(*) FROM ai_scores').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                evicted += self.conn.execute(
+                    'DELETE FROM ai_scores WHERE key IN '
+                    '(SELECT key FROM ai_scores ORDER BY last_used LIMIT ?)',
+                    (overflow,)
+                ).rowcount
+
+            self.counters['evicted'] += evicted
+            self.conn.commit()
+
+    def stats(self):
+        with self.lock:
+            size = self.conn.execute('SELECT COUNT(*) FROM ai_scores').fetchone()[0]
+            counters = dict(self.counters)
+
+        lookups = counters['hits'] + counters['misses']
+        counters['size'] = size
+        counters['hit_rate'] = round(counters['hits'] / lookups, 3) if lookups else None
+        return counters
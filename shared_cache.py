@@ -0,0 +1,103 @@
+"""
+=============================================================================
+NIRVANA READ - Cross-Process Shared Cache
+Gunicorn workers elect one refresher with a non-blocking file lock; it writes
+each published snapshot to disk atomically and the others load it from there.
+The same file gives a restarted app its last cache back instantly.
+=============================================================================
+"""
+
+import json
+import os
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows - every process refreshes for itself
+    fcntl = None
+
+# Snapshot file header - bump SNAPSHOT_SCHEMA_VERSION when the item format changes
+SNAPSHOT_SCHEMA = 'nirvana-read/news-snapshot'
+SNAPSHOT_SCHEMA_VERSION = 1
+
+
+class RefresherLock:
+    """flock()-based leader election; the lock is held until the process exits"""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    @property
+    def held(self):
+        return self.fd is not None
+
+    def try_acquire(self):
+        if self.fd is not None:
+            return True
+        if fcntl is None:
+            return True
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # Purely informational - who is refreshing
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self.fd = fd
+        return True
+
+
+def write_json_file(path, data):
+    """Write JSON atomically (temp file + rename) so readers never see half a file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def read_json_file(path):
+    """Parsed JSON file, or None if it doesn't exist"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot_file(path, items, timestamp, version):
+    """Write a published snapshot atomically"""
+    write_json_file(path, {
+        'schema': SNAPSHOT_SCHEMA,
+        'schema_version': SNAPSHOT_SCHEMA_VERSION,
+        'version': version,
+        'timestamp': timestamp.isoformat() if timestamp else None,
+        'items': list(items)
+    })
+
+
+def read_snapshot_file(path):
+    """(items, timestamp, version) from a snapshot file, or None if missing/incompatible"""
+    data = read_json_file(path)
+    if data is None:
+        return None
+
+    if data.get('schema') != SNAPSHOT_SCHEMA or data.get('schema_version') != SNAPSHOT_SCHEMA_VERSION:
+        print(f"⚠️ Ignoring snapshot {path}: schema {data.get('schema')} v{data.get('schema_version')}")
+        return None
+
+    timestamp = datetime.fromisoformat(data['timestamp']) if data.get('timestamp') else None
+    return data['items'], timestamp, data['version']
+
+
+def file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,102 @@
+"""
+=============================================================================
+NIRVANA READ - Near-Duplicate Story Clustering
+MinHash signatures over word bigrams of title + description, bucketed with
+LSH, so the same (often wire-syndicated) story from several sources is
+scored once and shown once, with the other sources as alternates
+=============================================================================
+"""
+
+import hashlib
+import struct
+
+from text_normalize import article_terms
+
+
+def story_shingles(words):
+    """Bigrams of an article's normalized terms (single words for one-word texts)"""
+    if len(words) < 2:
+        return frozenset(words)
+    return frozenset(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+
+class StoryClusters:
+    """
+    LSH index of cluster representatives (one per story).
+    `threshold` is the bigram Jaccard similarity above which two articles
+    are the same story; bands x rows = num_perm sets the candidate recall.
+    Only the refresher touches it - no locking.
+    """
+
+    def __init__(self, threshold=0.5, num_perm=16, bands=8):
+        assert num_perm % bands == 0 and num_perm % 16 == 0
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        # One 64-byte blake2b digest = 16 independent 32-bit hash functions
+        self.salts = [str(i).encode() for i in range(num_perm // 16)]
+        self.buckets = {}  # (band, band signature) -> set of representative urls
+        self.representatives = {}  # url -> (shingles, band keys, publishedAt)
+
+    def __len__(self):
+        return len(self.representatives)
+
+    def signature(self, shingles):
+        """MinHash: per hash function, the smallest value over all shingles"""
+        signature = []
+        for salt in self.salts:
+            rows = [struct.unpack('<16I', hashlib.blake2b(shingle.encode(), digest_size=64, salt=salt).digest())
+                    for shingle in shingles]
+            signature.extend(min(column) for column in zip(*rows))
+        return signature
+
+    def _band_keys(self, shingles):
+        signature = self.signature(shingles)
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for band in range(self.bands)]
+
+    def assign(self, article):
+        """
+        Representative url of the story `article` belongs to, or None if it
+        starts a new story (it then becomes that story's representative).
+        """
+        # A representative seen again (e.g. left unseen after a fallback score,
+        # so it is re-scored) is its own story, not a duplicate of itself
+        if article['url'] in self.representatives:
+            return None
+
+        shingles = story_shingles(article_terms(article).split())
+        if not shingles:
+            return None
+        band_keys = self._band_keys(shingles)
+
+        # LSH gives candidates; exact Jaccard on the shingle sets decides
+        best_url, best_similarity = None, self.threshold
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self.buckets.get(key, ()))
+        for url in candidates:
+            other = self.representatives[url][0]
+            similarity = len(shingles & other) / len(shingles | other)
+            if similarity >= best_similarity:
+                best_url, best_similarity = url, similarity
+        if best_url is not None:
+            return best_url
+
+        self.representatives[article['url']] = (shingles, band_keys, article['publishedAt'])
+        for key in band_keys:
+            self.buckets.setdefault(key, set()).add(article['url'])
+        return None
+
+    def expire(self, cutoff):
+        """Forget representatives published before `cutoff` ('%Y-%m-%dT%H:%M:%SZ' string)"""
+        stale = [url for url, (_, _, published) in self.representatives.items() if published < cutoff]
+        for url in stale:
+            _, band_keys, _ = self.representatives.pop(url)
+            for key in band_keys:
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(url)
+                    if not bucket:
+                        del self.buckets[key]
+        return len(stale)
@@ -49,3 +49,7 @@ def setup_database_tables():
 def cleanup_old_data(days=90):
     """Cleanup old data (disabled)"""
     return False
+
+def track_interactions_batch(events):
+    """Bulk insert interactions + feedback + category stats (no-op without Supabase)"""
+    return True
@@ -0,0 +1,123 @@
+"""
+=============================================================================
+NIRVANA READ - Text Normalization for Matching and Search
+One pipeline for keywords, articles and search queries: NFC, case folding,
+nukta / chandrabindu / zero-width-joiner folding, word tokens that keep
+Devanagari vowel signs, and a light English + Hindi suffix stemmer.
+An article's terms are computed once, when the feed entry is parsed, and
+kept on the article dict as 'terms'.
+=============================================================================
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Vowel signs and virama are not \w, so the Devanagari block is listed
+# explicitly - minus the dandas (U+0964 / U+0965), which end sentences
+TOKEN_RE = re.compile(r'[\wऀ-ॣ०-ॿ]+')
+
+# Spelling variants that should compare equal: nukta forms (ड़ / ड, फ़ / फ -
+# NFC keeps U+0958-U+095F decomposed, so dropping the nukta sign covers both
+# encodings), chandrabindu written as anusvara, and invisible joiners.
+# (replace() on the few texts that have them beats str.translate on all.)
+_FOLD = (
+    ('\u093c', ''),        # nukta
+    ('\u0901', '\u0902'),  # chandrabindu -> anusvara
+    ('\u200c', ''),        # zero-width non-joiner
+    ('\u200d', ''),        # zero-width joiner
+)
+
+# Longest first
+HINDI_SUFFIXES = ('ियों', 'ियां', 'ाओं', 'ाएं', 'ुओं', 'ुएं', 'ों', 'ें', 'ओं', 'एं', 'ा', 'े', 'ी')
+
+# A word is left whole rather than cut below this many code points: three-letter
+# stems merge unrelated words ('far' / 'fare', 'पाने' / 'पानी' -> 'पान')
+MIN_STEM = 4
+
+# ...except these plurals of short category keywords, which should still match them
+SHORT_PLURALS = {
+    'fees': 'fee', 'laws': 'law', 'taxes': 'tax', 'buses': 'bus',
+    'atms': 'atm', 'emis': 'emi', 'pils': 'pil', 'iits': 'iit',
+}
+
+
+def normalize(text):
+    """NFC, case-folded, with the spelling variants in _FOLD folded away"""
+    if not unicodedata.is_normalized('NFC', text):
+        text = unicodedata.normalize('NFC', text)
+    text = text.casefold()
+    for variant, folded in _FOLD:
+        if variant in text:
+            text = text.replace(variant, folded)
+    return text
+
+
+def _stem_latin(word):
+    if word.endswith('ies'):
+        stemmed = word[:-3] + 'y'
+    elif word.endswith('sses'):
+        stemmed = word[:-2]
+    elif word.endswith('s') and word[-2:-1] not in ('s', 'u'):
+        stemmed = word[:-1]
+    elif word.endswith('ing'):
+        stemmed = word[:-3]
+    elif word.endswith('ed') and not word.endswith('eed'):
+        stemmed = word[:-2]
+    else:
+        stemmed = word
+    if stemmed.endswith('e') and len(stemmed) > MIN_STEM:
+        stemmed = stemmed[:-1]
+    # Short stems collide with everyday words ('fare' / 'far', 'rape' / 'rap')
+    return stemmed if len(stemmed) >= MIN_STEM else word
+
+
+def _stem_hindi(word):
+    for suffix in HINDI_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Light suffix stemming of one normalized token: plurals, -ing/-ed, Hindi case endings"""
+    if token.isascii():
+        if token in SHORT_PLURALS:
+            return SHORT_PLURALS[token]
+        return _stem_latin(token) if token.isalpha() else token
+    if 'ऀ' <= token[-1] <= 'ॿ':
+        return _stem_hindi(token)
+    return token
+
+
+def tokens(text):
+    """Normalized, unstemmed word tokens of `text`, in order"""
+    return TOKEN_RE.findall(normalize(text))
+
+
+def terms(text):
+    """Stemmed word tokens of `text`, in order"""
+    return [stem(token) for token in tokens(text)]
+
+
+def joined(words):
+    """Words joined by single spaces, with a space at both ends (' ' if there are none)"""
+    return f" {' '.join(words)} " if words else ' '
+
+
+def term_text(text):
+    """
+    joined(terms(text)). Keywords get the same treatment, so
+    `' fee ' in term_text(...)` is a whole-word test ('coffee' no longer
+    contains 'fee') and phrases match word for word.
+    """
+    return joined(terms(text))
+
+
+def article_terms(article):
+    """An article's 'terms' (term_text of title + description), computed if it has none"""
+    text = article.get('terms')
+    if text is None:
+        text = term_text(f"{article['title']} {article['description']}")
+    return text
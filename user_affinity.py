@@ -0,0 +1,133 @@
+"""
+=============================================================================
+NIRVANA READ - Per-User Category Affinity
+One small vector per user (category -> engagement weight, halving every
+AFFINITY_HALF_LIFE_DAYS) in SQLite, with an LRU of recent users in front.
+The tracking flusher feeds it; /api/news turns it into per-category boosts.
+=============================================================================
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+ACTION_WEIGHTS = {'view': 1.0, 'mark_reviewed': 2.0}
+READING_SECONDS_PER_POINT = 120  # reading_time adds one point per two minutes...
+MAX_READING_POINTS = 3  # ...up to this many
+AFFINITY_HALF_LIFE_DAYS = 30
+
+
+def interaction_weight(event):
+    reading_time = event.get('reading_time') or 0
+    try:
+        reading_points = min(float(reading_time) / READING_SECONDS_PER_POINT, MAX_READING_POINTS)
+    except (TypeError, ValueError):
+        reading_points = 0.0
+    return ACTION_WEIGHTS.get(event.get('action'), 0.5) + max(reading_points, 0.0)
+
+
+def decayed(weight, updated_at, now, half_life_days=AFFINITY_HALF_LIFE_DAYS):
+    return weight * 0.5 ** ((now - updated_at) / (half_life_days * 86400))
+
+
+class UserAffinityStore:
+    """
+    SQLite-backed affinity vectors with a bounded LRU cache. Other workers
+    write the same file, so cached vectors are reloaded after `ttl` seconds.
+    """
+
+    def __init__(self, path, max_users=2048, ttl=60.0, half_life_days=AFFINITY_HALF_LIFE_DAYS):
+        self.max_users = max_users
+        self.ttl = ttl
+        self.half_life_days = half_life_days
+        self.cache = OrderedDict()  # user_id -> (vector, loaded_at)
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS user_affinity (
+                user_id TEXT NOT NULL,
+                category_key TEXT NOT NULL,
+                weight REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (user_id, category_key)
+            )
+        ''')
+
+    def record_many(self, events):
+        """Fold a batch of interaction events into the stored vectors"""
+        totals = {}
+        for event in events:
+            user_id, category = event.get('user_id'), event.get('category')
+            if not user_id or not category:
+                continue
+            key = (user_id, category)
+            totals[key] = totals.get(key, 0.0) + interaction_weight(event)
+        if not totals:
+            return
+
+        now = time.time()
+        with self.lock:
+            # IMMEDIATE: workers flushing at the same moment take turns
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                for (user_id, category), weight in totals.items():
+                    row = self.conn.execute(
+                        'SELECT weight, updated_at FROM user_affinity WHERE user_id = ? AND category_key = ?',
+                        (user_id, category)
+                    ).fetchone()
+                    if row:
+                        weight += decayed(row[0], row[1], now, self.half_life_days)
+                    self.conn.execute(
+                        'INSERT OR REPLACE INTO user_affinity (user_id, category_key, weight, updated_at) '
+                        'VALUES (?, ?, ?, ?)',
+                        (user_id, category, weight, now)
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+            for user_id, _ in totals:
+                self.cache.pop(user_id, None)
+
+    def vector(self, user_id):
+        """{category: current weight} for a user ({} if unknown)"""
+        now = time.monotonic()
+        with self.lock:
+            cached = self.cache.get(user_id)
+            if cached is not None and now - cached[1] < self.ttl:
+                self.cache.move_to_end(user_id)
+                return cached[0]
+
+            rows = self.conn.execute(
+                'SELECT category_key, weight, updated_at FROM user_affinity WHERE user_id = ?', (user_id,)
+            ).fetchall()
+            wall_now = time.time()
+            vector = {category: decayed(weight, updated_at, wall_now, self.half_life_days)
+                      for category, weight, updated_at in rows}
+
+            self.cache[user_id] = (vector, now)
+            self.cache.move_to_end(user_id)
+            while len(self.cache) > self.max_users:
+                self.cache.popitem(last=False)
+            return vector
+
+    def boosts(self, user_id, strength):
+        """
+        Score multipliers per category: the user's favourite category gets
+        1 + strength, the others proportionally less. None without history.
+        """
+        vector = self.vector(user_id) if user_id else {}
+        top = max(vector.values(), default=0.0)
+        if top <= 0:
+            return None
+        return {category: 1 + strength * weight / top for category, weight in vector.items()}
+
+    def stats(self):
+        with self.lock:
+            return {'cached_users': len(self.cache), 'max_users': self.max_users}